@@ -4,8 +4,12 @@ __all__ = (
     "HOTPAlgorithm",
     "TOTPAlgorithm",
     "AbstractAlgorithm",
+    "KeyedHOTPAlgorithm",
+    "KeyedTOTPAlgorithm",
 )
 
 from rest_multi_factor.algorithms.hotp import HOTPAlgorithm
 from rest_multi_factor.algorithms.totp import TOTPAlgorithm
 from rest_multi_factor.algorithms.abstract import AbstractAlgorithm
+from rest_multi_factor.algorithms.hotp import KeyedHOTPAlgorithm
+from rest_multi_factor.algorithms.totp import KeyedTOTPAlgorithm
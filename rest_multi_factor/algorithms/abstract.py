@@ -13,6 +13,7 @@ from rest_multi_factor.settings import multi_factor_settings
 class AbstractAlgorithm(metaclass=ABCMeta):
     """Abstract base class for algorithm implementations."""
 
+    constant_time = multi_factor_settings.ALGORITHM_CONSTANT_TIME
     should_validate = multi_factor_settings.ALGORITHM_RFC_VALIDATION
 
     @abstractmethod
@@ -2,6 +2,7 @@
 
 __all__ = (
     "HOTPAlgorithm",
+    "KeyedHOTPAlgorithm",
 )
 
 import hmac
@@ -15,6 +16,11 @@ from rest_multi_factor.exceptions import RFCGuidanceException
 from rest_multi_factor.algorithms.abstract import AbstractAlgorithm
 
 
+# the counter as 8-byte big-endian and the 4-byte truncated value
+COUNTER_FORMAT = struct.Struct("!Q")
+TRUNCATE_FORMAT = struct.Struct("!I")
+
+
 class HOTPAlgorithm(AbstractAlgorithm):
     """HOTP algorithm implementation."""
 
@@ -44,23 +50,58 @@ class HOTPAlgorithm(AbstractAlgorithm):
         :return: The calculated HOTP value
         :rtype: int
         """
-        if self.should_validate:
-            self.validate(secret, digits)
+        return self.bind(secret, digits, algorithm).calculate(counter)
 
-        packed = struct.pack("!Q", counter)
-        result = hmac.new(secret, packed, algorithm).digest()
+    def verify_window(self, secret, value, counters, digits=6,
+                      algorithm=hashlib.sha1):
+        """
+        Verify a HOTP value against a window of counters.
 
-        modulo = 10 ** digits
-        offset = result[19] & 0x0F
+        :param secret: The shared secret
+        :type secret: bytes
 
-        value = (
-            (result[offset] & 0x7F) << 24
-            | (result[offset+1] & 0xFF) << 16
-            | (result[offset+2] & 0xFF) << 8
-            | (result[offset+3] & 0xFF)
-        )
+        :param value: The HOTP value to verify
+        :type value: str | int
 
-        return value % modulo
+        :param counters: The counters to try, in order of preference
+        :type counters: iterable of int
+
+        :param digits: The number of digits for the HOTP value
+        :type digits: int
+
+        :param algorithm: The hash algorithm to use
+        :type algorithm: function
+
+        :return: The matching counter or None if nothing matched
+        :rtype: int | None
+        """
+        keyed = self.bind(secret, digits, algorithm)
+        return keyed.verify_window(value, counters, self.constant_time)
+
+    def bind(self, secret, digits=6, algorithm=hashlib.sha1):
+        """
+        Bind the algorithm to a shared secret.
+
+        The HMAC key schedule is computed once for the returned
+        object, which makes it the preferred way to calculate
+        multiple values for the same secret (e.g. a window scan).
+
+        :param secret: The shared secret
+        :type secret: bytes
+
+        :param digits: The number of digits for the HOTP value
+        :type digits: int
+
+        :param algorithm: The hash algorithm to use
+        :type algorithm: function
+
+        :return: The keyed algorithm
+        :rtype: KeyedHOTPAlgorithm
+        """
+        if self.should_validate:
+            self.validate(secret, digits)
+
+        return KeyedHOTPAlgorithm(secret, digits, algorithm)
 
     def validate(self, secret, digits):
         """
@@ -101,3 +142,115 @@ class HOTPAlgorithm(AbstractAlgorithm):
                 "as defined by RFC 4226 section 4 - requirement 4",
                 RFCGuidanceWarning
             )
+
+
+class KeyedHOTPAlgorithm(object):
+    """
+    HOTP algorithm that is bound to a single shared secret.
+
+    The inner and outer padded keys of the HMAC are derived once,
+    every calculation continues from a copy of that state. The position
+    of the truncation offset depends on the digest size and is also
+    determined once.
+    """
+
+    __slots__ = ("digits", "modulo", "_state", "_offset")
+
+    def __init__(self, secret, digits=6, algorithm=hashlib.sha1):
+        """
+        Initialize the keyed algorithm.
+
+        :param secret: The shared secret
+        :type secret: bytes
+
+        :param digits: The number of digits for the HOTP value
+        :type digits: int
+
+        :param algorithm: The hash algorithm to use
+        :type algorithm: function
+        """
+        self.digits = digits
+        self.modulo = 10 ** digits
+
+        self._state = hmac.new(secret, digestmod=algorithm)
+        self._offset = self._state.digest_size - 1
+
+    def calculate(self, counter):
+        """
+        Calculate a HOTP value for the bound secret.
+
+        :param counter: The 'moving factor' that is shared between client
+                        and server
+        :type counter: int
+
+        :return: The calculated HOTP value
+        :rtype: int
+        """
+        return self._calculate(counter)
+
+    def verify_window(self, value, counters, constant_time=False):
+        """
+        Verify a HOTP value against a window of counters.
+
+        In constant time mode every counter of the window is evaluated
+        and compared as a zero-padded string with `hmac.compare_digest`,
+        so the time spent doesn't depend on the counter that matched.
+
+        :param value: The HOTP value to verify
+        :type value: str | int
+
+        :param counters: The counters to try, in order of preference
+        :type counters: iterable of int
+
+        :param constant_time: Whether to verify in constant time or not
+        :type constant_time: bool
+
+        :return: The matching counter or None if nothing matched
+        :rtype: int | None
+        """
+        try:
+            value = int(value)
+
+        except (TypeError, ValueError):
+            return None
+
+        if not constant_time:
+            for counter in counters:
+                if self._calculate(counter) == value:
+                    return counter
+
+            return None
+
+        matched = None
+        expected = "{0:0{1}d}".format(value, self.digits)
+
+        for counter in counters:
+            tryout = "{0:0{1}d}".format(self._calculate(counter), self.digits)
+            found = hmac.compare_digest(tryout, expected)
+
+            matched = counter if found and matched is None else matched
+
+        return matched
+
+    def _calculate(self, counter):
+        """
+        Calculate the HOTP value of a counter.
+
+        The dynamic truncation of RFC 4226 section 5.3 takes the offset
+        from the low-order bits of the last byte of the digest, which
+        is byte 19 for SHA-1 but not for SHA-256 or SHA-512.
+
+        :param counter: The counter to calculate the value for
+        :type counter: int
+
+        :return: The calculated HOTP value
+        :rtype: int
+        """
+        state = self._state.copy()
+        state.update(COUNTER_FORMAT.pack(counter))
+
+        result = state.digest()
+        offset = result[self._offset] & 0x0F
+
+        value = TRUNCATE_FORMAT.unpack_from(result, offset)[0] & 0x7FFFFFFF
+        return value % self.modulo
@@ -2,6 +2,7 @@
 
 __all__ = (
     "TOTPAlgorithm",
+    "KeyedTOTPAlgorithm",
 )
 
 import time
@@ -9,6 +10,7 @@ import hashlib
 
 
 from rest_multi_factor.algorithms.hotp import HOTPAlgorithm
+from rest_multi_factor.algorithms.hotp import KeyedHOTPAlgorithm
 
 
 class TOTPAlgorithm(HOTPAlgorithm):
@@ -24,6 +26,16 @@ class TOTPAlgorithm(HOTPAlgorithm):
     change (every 30 seconds) without the secret that changes.
     """
 
+    def __init__(self, clock=None):
+        """
+        Initialize the algorithm.
+
+        :param clock: Callable that returns the current (unix) time,
+                      `time.time` is used when omitted
+        :type clock: callable | None
+        """
+        self.clock = clock
+
     def calculate(self, secret, step=30, time_zero=0, digits=6, drift=0,
                   algorithm=hashlib.sha1):
         """
@@ -54,13 +66,77 @@ class TOTPAlgorithm(HOTPAlgorithm):
         :return: The encoded secret (The TOTP value)
         :rtype: int
         """
-        calculated = self.calculate_step(time_zero, step, drift)
-        return HOTPAlgorithm.calculate(
-            self, secret, calculated, digits, algorithm
+        keyed = self.bind(secret, step, time_zero, digits, algorithm)
+        return keyed.calculate(drift)
+
+    def verify_window(self, secret, value, tolerance, step=30, time_zero=0,
+                      digits=6, algorithm=hashlib.sha1):
+        """
+        Verify a TOTP value within a tolerance of steps.
+
+        :param secret: The shared secret
+        :type secret: bytes
+
+        :param value: The TOTP value to verify
+        :type value: str | int
+
+        :param tolerance: The number of steps to accept back and forward
+        :type tolerance: int
+
+        :param step: The number of seconds within a step
+        :type step: int
+
+        :param time_zero: The start time to count the number of steps from.
+        :type time_zero: int
+
+        :param digits: The number of digits that the TOPT value will have
+        :type digits: int
+
+        :param algorithm: The hash algorithm to use
+        :type algorithm: function
+
+        :return: The matching drift or None if nothing matched
+        :rtype: int | None
+        """
+        keyed = self.bind(secret, step, time_zero, digits, algorithm)
+        return keyed.verify_window(value, tolerance, self.constant_time)
+
+    def bind(self, secret, step=30, time_zero=0, digits=6,
+             algorithm=hashlib.sha1):
+        """
+        Bind the algorithm to a shared secret.
+
+        The HMAC key schedule is computed once for the returned
+        object, so the values of multiple drifts can be calculated
+        without deriving the key again.
+
+        :param secret: The secret that will be encoded to a TOTP value
+        :type secret: bytes
+
+        :param step: The number of seconds within a step
+        :type step: int
+
+        :param time_zero: The start time to count the number of steps from.
+        :type time_zero: int
+
+        :param digits: The number of digits that the TOPT value will have
+        :type digits: int
+
+        :param algorithm: The hash algorithm to use
+        :type algorithm: function
+
+        :return: The keyed algorithm
+        :rtype: KeyedTOTPAlgorithm
+        """
+        if self.should_validate:
+            self.validate(secret, digits)
+
+        return KeyedTOTPAlgorithm(
+            secret, step, time_zero, digits, algorithm, self.clock
         )
 
     @staticmethod
-    def calculate_step(time_zero, step, drift):
+    def calculate_step(time_zero, step, drift, now=None):
         """
         Calculate the number of steps, this will serve as the HOTP counter.
 
@@ -74,7 +150,129 @@ class TOTPAlgorithm(HOTPAlgorithm):
         validation to get a TOTP value of a number of steps forward or back
         :type drift: int
 
+        :param now: The current time, `time.time()` when omitted
+        :type now: int | float | None
+
         :return: The number of steps within the time range from time zero (T0)
                  until the current time.
         """
-        return ((int(time.time()) - time_zero) // step) + drift
+        if now is None:
+            now = time.time()
+
+        return ((int(now) - time_zero) // step) + drift
+
+
+class KeyedTOTPAlgorithm(KeyedHOTPAlgorithm):
+    """TOTP algorithm that is bound to a single shared secret."""
+
+    __slots__ = ("step", "time_zero", "clock")
+
+    def __init__(self, secret, step=30, time_zero=0, digits=6,
+                 algorithm=hashlib.sha1, clock=None):
+        """
+        Initialize the keyed algorithm.
+
+        :param secret: The shared secret
+        :type secret: bytes
+
+        :param step: The number of seconds within a step
+        :type step: int
+
+        :param time_zero: The start time to count the number of steps from.
+        :type time_zero: int
+
+        :param digits: The number of digits for the TOTP value
+        :type digits: int
+
+        :param algorithm: The hash algorithm to use
+        :type algorithm: function
+
+        :param clock: Callable that returns the current (unix) time,
+                      `time.time` is used when omitted
+        :type clock: callable | None
+        """
+        super().__init__(secret, digits, algorithm)
+
+        self.step = step
+        self.clock = clock
+        self.time_zero = time_zero
+
+    def calculate(self, drift=0):
+        """
+        Calculate a TOTP value for the bound secret.
+
+        :param drift: The number of steps forward or back
+        :type drift: int
+
+        :return: The calculated TOTP value
+        :rtype: int
+        """
+        return self._calculate(self.get_step() + drift)
+
+    def verify_window(self, value, tolerance, constant_time=False):
+        """
+        Verify a TOTP value within a tolerance of steps.
+
+        The current step is calculated once, so the whole window is
+        based on the same moment in time.
+
+        :param value: The TOTP value to verify
+        :type value: str | int
+
+        :param tolerance: The number of steps to accept back and forward
+        :type tolerance: int
+
+        :param constant_time: Whether to verify in constant time or not
+        :type constant_time: bool
+
+        :return: The matching drift or None if nothing matched
+        :rtype: int | None
+        """
+        counters = self.get_window(tolerance)
+        matched = self.verify_steps(value, counters, constant_time)
+
+        base = counters.stop - tolerance - 1
+        return None if matched is None else matched - base
+
+    def verify_steps(self, value, steps, constant_time=False):
+        """
+        Verify a TOTP value against the given steps.
+
+        :param value: The TOTP value to verify
+        :type value: str | int
+
+        :param steps: The steps to try, in order of preference
+        :type steps: iterable of int
+
+        :param constant_time: Whether to verify in constant time or not
+        :type constant_time: bool
+
+        :return: The matching step or None if nothing matched
+        :rtype: int | None
+        """
+        return KeyedHOTPAlgorithm.verify_window(
+            self, value, steps, constant_time
+        )
+
+    def get_window(self, tolerance):
+        """
+        Get the steps within a tolerance of the current step.
+
+        :param tolerance: The number of steps back and forward
+        :type tolerance: int
+
+        :return: The steps of the window
+        :rtype: range
+        """
+        base = self.get_step()
+        return range(base - tolerance, base + tolerance + 1)
+
+    def get_step(self):
+        """
+        Get the current step, the clock is read once per call.
+
+        :return: The number of steps from time zero until now
+        :rtype: int
+        """
+        now = None if self.clock is None else self.clock()
+        return TOTPAlgorithm.calculate_step(self.time_zero, self.step, 0, now)
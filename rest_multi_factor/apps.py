@@ -12,6 +12,16 @@ class RestMultiFactorConfig(AppConfig):
     name = 'rest_multi_factor'
 
     def ready(self):
-        """Initialize the registry when all models are loaded."""
+        """Initialize the registry and signals when all models are loaded."""
+        from rest_multi_factor.models import Challenge, Device
+        from rest_multi_factor.signals import connect_signals
+        from rest_multi_factor.utils import get_subclassed_models
+
+        # discover the devices and challenges once
+        get_subclassed_models(Device)
+        get_subclassed_models(Challenge)
+
         if not registry.initialized:
             registry.initialize()
+
+        connect_signals()
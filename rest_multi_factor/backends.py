@@ -1,19 +1,26 @@
 """Backends for checking how many verifications are needed."""
 
 __all__ = (
+    "CachedBackend",
+    "CounterBackend",
     "DefaultBackend",
     "AbstractVerificationBackend",
 )
 
+import urllib.parse
+
 from abc import ABCMeta, abstractmethod
 
 
-from django import VERSION
-from django.db.models.query import Q
+from django.core.cache import cache as default_cache
+from django.db.models.expressions import F
 
 
-from rest_multi_factor.utils import unify_queryset
-from rest_multi_factor.models import Challenge
+from rest_multi_factor.utils import get_subclassed_models
+from rest_multi_factor.models import Challenge, VerificationCounter
+from rest_multi_factor.queries import confirmed_challenges, user_devices
+from rest_multi_factor.queries import verification_state
+from rest_multi_factor.containers import VerificationState
 from rest_multi_factor.settings import multi_factor_settings
 
 
@@ -35,6 +42,82 @@ class AbstractVerificationBackend(metaclass=ABCMeta):
         :rtype: int
         """
 
+    def get_state(self, token, user, view):
+        """
+        Get the verifications left and whether the user has devices.
+
+        Whether the user has devices is only checked when there are
+        verifications left, otherwise it's always True.
+
+        :param token: The token to check
+        :type token: rest_framework.authtoken.Token | knox.model.AuthToken
+
+        :param user: The owner of the token
+        :type user: django.contrib.auth.models.AbstractBaseUser
+
+        :param view: The current view
+        :type view: rest_framework.views.APIView | None
+
+        :return: The state of the verification
+        :rtype: rest_multi_factor.containers.VerificationState
+        """
+        left = self.verify(token, view)
+
+        if left <= 0:
+            return VerificationState(left, True)
+
+        return VerificationState(left, bool(user_devices.execute(user=user)))
+
+    def confirm(self, token, view, save):
+        """
+        Get the number of verifications left when a challenge is confirmed.
+
+        By default the challenge is stored first after which the
+        verifications left are checked as usual.
+
+        :param token: The token of the confirmed challenge
+        :type token: rest_framework.authtoken.Token | knox.model.AuthToken
+
+        :param view: The current view
+        :type view: rest_framework.views.APIView
+
+        :param save: Callable that stores the confirmed challenge
+        :type save: callable
+
+        :return: The number of verifications left
+        :rtype: int
+        """
+        save()
+        return self.verify(token, view)
+
+    def invalidate(self, token):
+        """
+        Invalidate any stored verification state of a token.
+
+        This is called when a challenge of the token is saved or deleted
+        and when the token itself is deleted. Backends that don't store
+        any state don't have to override this.
+
+        :param token: The token of which the state changed
+        :type token: rest_framework.authtoken.Token | knox.model.AuthToken
+        """
+
+    def update_confirmed(self, token, delta):
+        """
+        Update the number of confirmed challenges of a token.
+
+        This is called when a challenge of the token is confirmed (+1),
+        unconfirmed or deleted while confirmed (-1) and with a delta of
+        zero when a token is created. Backends that don't store any
+        state don't have to override this.
+
+        :param token: The token of which the state changed
+        :type token: rest_framework.authtoken.Token | knox.model.AuthToken
+
+        :param delta: The change of the number of confirmed challenges
+        :type delta: int
+        """
+
     def get_verifications(self):
         """
         Get the number of verifications required.
@@ -77,11 +160,213 @@ class DefaultBackend(AbstractVerificationBackend):
         :return: The number of verifications left
         :rtype: int
         """
-        filter = Q(token=token) & Q(confirm=True)
-        queryset = unify_queryset(Challenge, fields=("id",), filter=filter)
+        return self.get_verifications() - self.get_confirmed(token)
+
+    def confirm(self, token, view, save):
+        """
+        Get the number of verifications left when a challenge is confirmed.
+
+        The verifications left are checked before the challenge is
+        stored, so the count doesn't have to be queried again.
+
+        :param token: The token of the confirmed challenge
+        :type token: rest_framework.authtoken.Token | knox.model.AuthToken
+
+        :param view: The current view
+        :type view: rest_framework.views.APIView
+
+        :param save: Callable that stores the confirmed challenge
+        :type save: callable
+
+        :return: The number of verifications left
+        :rtype: int
+        """
+        left = self.verify(token, view)
+        save()
+
+        return left - 1
+
+    def get_state(self, token, user, view):
+        """
+        Get the verifications left and whether the user has devices.
+
+        Both are answered by one UNION query over all challenges
+        and devices.
+
+        :param token: The token to check
+        :type token: rest_framework.authtoken.Token | knox.model.AuthToken
+
+        :param user: The owner of the token
+        :type user: django.contrib.auth.models.AbstractBaseUser
+
+        :param view: The current view
+        :type view: rest_framework.views.APIView | None
+
+        :return: The state of the verification
+        :rtype: rest_multi_factor.containers.VerificationState
+        """
+        rows = verification_state.execute(token=token, user=user)
+        challenges = len(get_subclassed_models(Challenge))
+
+        confirmed = sum(1 for row in rows if row[0] < challenges)
+        left = self.get_verifications() - confirmed
+
+        return VerificationState(left, confirmed < len(rows))
+
+    def get_confirmed(self, token):
+        """
+        Count the confirmed challenges of a token.
+
+        :param token: The token to check
+        :type token: rest_framework.authtoken.Token | knox.model.AuthToken
+
+        :return: The number of confirmed challenges
+        :rtype: int
+        """
+        return len(confirmed_challenges.execute(token=token))
+
+
+class CachedBackend(DefaultBackend):
+    """
+    Backend that caches the verification state per token.
+
+    The number of confirmed challenges of a token is stored in the
+    cache on the first check, so checks after that don't query the
+    database. The state is refreshed through signals once a change
+    to a challenge of the token or the token itself is committed.
+
+    Checks only add missing states to the cache, so a check that read
+    the state before a change was committed can't overwrite the state
+    that was refreshed after it.
+    """
+
+    cache = default_cache
+
+    # devices only need to be queried when the cached state isn't verified
+    get_state = AbstractVerificationBackend.get_state
+
+    def get_confirmed(self, token):
+        """
+        Count the confirmed challenges of a token through the cache.
+
+        :param token: The token to check
+        :type token: rest_framework.authtoken.Token | knox.model.AuthToken
+
+        :return: The number of confirmed challenges
+        :rtype: int
+        """
+        key = self.get_cache_key(token)
+        confirmed = self.cache.get(key)
+
+        if confirmed is None:
+            confirmed = super().get_confirmed(token)
+            self.cache.add(key, confirmed, self.get_cache_timeout())
+
+        return confirmed
+
+    def invalidate(self, token):
+        """
+        Refresh the cached verification state of a token.
+
+        The state is counted again and replaces the cached state,
+        instead of removing it, so stale checks can't add it again.
+
+        :param token: The token of which the state changed
+        :type token: rest_framework.authtoken.Token | knox.model.AuthToken
+        """
+        confirmed = super().get_confirmed(token)
 
-        # ticket: https://code.djangoproject.com/ticket/28399
-        if VERSION < (1, 11, 4):
-            return self.get_verifications() - len(queryset)  # pragma: no cover
+        key = self.get_cache_key(token)
+        self.cache.set(key, confirmed, self.get_cache_timeout())
+
+    def get_cache_key(self, token):
+        """
+        Get the cache key of a token.
+
+        :param token: The token to get the key for
+        :type token: rest_framework.authtoken.Token | knox.model.AuthToken
+
+        :return: The cache key
+        :rtype: str
+        """
+        return urllib.parse.quote("verification {0}".format(token.pk))
+
+    def get_cache_timeout(self):
+        """
+        Retrieve the number of seconds to cache the state.
+
+        :return: The cache timeout
+        :rtype: int
+        """
+        return multi_factor_settings.VERIFICATION_CACHE_TIMEOUT
+
+
+class CounterBackend(DefaultBackend):
+    """
+    Backend that keeps a denormalized counter per token.
+
+    The number of confirmed challenges is stored in the
+    VerificationCounter model and updated atomically through
+    signals, so checking the state is a primary key lookup. Note
+    that updates through `QuerySet.update()` bypass the signals.
+    """
+
+    # devices only need to be queried when the counter isn't verified
+    get_state = AbstractVerificationBackend.get_state
+
+    def get_confirmed(self, token):
+        """
+        Retrieve the number of confirmed challenges of a token.
+
+        Tokens without a counter, like tokens that existed before
+        this backend was configured, are counted the default way.
+
+        :param token: The token to check
+        :type token: rest_framework.authtoken.Token | knox.model.AuthToken
+
+        :return: The number of confirmed challenges
+        :rtype: int
+        """
+        queryset = VerificationCounter.objects.filter(token=token)
+        confirmed = queryset.values_list("confirmed", flat=True).first()
+
+        if confirmed is None:
+            return super().get_confirmed(token)
+
+        return confirmed
+
+    def update_confirmed(self, token, delta):
+        """
+        Update the counter of a token with a F() expression.
+
+        Missing counters are created from the default count, which
+        already includes the change. They aren't created for decrements
+        because the token itself could be in the process of deletion,
+        and decrements never bring a counter below zero.
+
+        When a concurrent update created the counter first its count
+        can't include this change yet, so the change is applied to it.
+
+        :param token: The token of which the state changed
+        :type token: rest_framework.authtoken.Token | knox.model.AuthToken
+
+        :param delta: The change of the number of confirmed challenges
+        :type delta: int
+        """
+        queryset = VerificationCounter.objects.filter(token=token)
+
+        if delta < 0:
+            queryset = queryset.filter(confirmed__gte=-delta)
+
+        updated = queryset.update(confirmed=F("confirmed") + delta)
+
+        if updated or delta < 0:
+            return
+
+        counter, created = VerificationCounter.objects.get_or_create(
+            token=token,
+            defaults={"confirmed": super().get_confirmed(token)},
+        )
 
-        return self.get_verifications() - queryset.count()  # pragma: no cover
+        if not created and delta:
+            queryset.update(confirmed=F("confirmed") + delta)
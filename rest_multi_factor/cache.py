@@ -0,0 +1,111 @@
+"""Per-process caches for values that are expensive to retrieve."""
+
+__all__ = (
+    "LocalCache",
+)
+
+import time
+import threading
+
+from collections import OrderedDict
+
+
+class LocalCache(object):
+    """
+    Bounded per-process cache with expiring entries.
+
+    When the cache is full the least recently used entry
+    is evicted. This class is thread safe.
+    """
+
+    __slots__ = ("maxsize", "timeout", "timer", "_data", "_lock")
+
+    def __init__(self, maxsize=128, timeout=None, timer=time.monotonic):
+        """
+        Initialize the cache.
+
+        :param maxsize: The maximum number of entries
+        :type maxsize: int
+
+        :param timeout: The default number of seconds an entry is valid
+        :type timeout: int | float | None
+
+        :param timer: The function to retrieve the current time from
+        :type timer: callable
+        """
+        self.maxsize = maxsize
+        self.timeout = timeout
+        self.timer = timer
+
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        """Retrieve the number of (possibly expired) entries."""
+        return len(self._data)
+
+    def get(self, key, default=None):
+        """
+        Retrieve a value from the cache.
+
+        :param key: The key of the entry
+        :type key: collections.abc.Hashable
+
+        :param default: The value to return if there is no valid entry
+        :type default: any
+
+        :return: The cached value or the default
+        :rtype: any
+        """
+        with self._lock:
+            try:
+                expires, value = self._data[key]
+
+            except KeyError:
+                return default
+
+            if expires is not None and expires <= self.timer():
+                del self._data[key]
+                return default
+
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, timeout=None):
+        """
+        Store a value in the cache.
+
+        :param key: The key of the entry
+        :type key: collections.abc.Hashable
+
+        :param value: The value to store
+        :type value: any
+
+        :param timeout: The number of seconds the entry is valid,
+                        defaults to the timeout of the cache
+        :type timeout: int | float | None
+        """
+        timeout = self.timeout if timeout is None else timeout
+        expires = None if timeout is None else self.timer() + timeout
+
+        with self._lock:
+            self._data[key] = (expires, value)
+            self._data.move_to_end(key)
+
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        """
+        Remove a entry from the cache.
+
+        :param key: The key of the entry
+        :type key: collections.abc.Hashable
+        """
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        """Remove all entries from the cache."""
+        with self._lock:
+            self._data.clear()
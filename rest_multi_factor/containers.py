@@ -3,6 +3,7 @@
 __all__ = (
     "GeneralDeviceContainer",
     "SpecificDeviceContainer",
+    "VerificationState",
 )
 
 from collections import namedtuple
@@ -20,3 +21,8 @@ SpecificDeviceContainer = namedtuple("SpecificDeviceContainer", (
     "verbose_name",
     "dispatchable",
 ))
+
+VerificationState = namedtuple("VerificationState", (
+    "left",
+    "devices",
+))
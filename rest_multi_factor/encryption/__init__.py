@@ -8,7 +8,9 @@ way to encrypt or decrypt information.
 __all__ = (
     "AESEncryption",
     "AbstractEncryption",
+    "RotatingAESEncryption",
 )
 
 from rest_multi_factor.encryption.aes import AESEncryption
 from rest_multi_factor.encryption.abstract import AbstractEncryption
+from rest_multi_factor.encryption.aes import RotatingAESEncryption
@@ -3,27 +3,77 @@
 
 __all__ = (
     "AESEncryption",
+    "RotatingAESEncryption",
 )
 
 
 import base64
 import hashlib
 
+from functools import lru_cache
+
 
 from django.conf import settings
 
-from cryptography.fernet import Fernet
+from cryptography.fernet import Fernet, MultiFernet, InvalidToken
 
 
+from rest_multi_factor.settings import multi_factor_settings
 from rest_multi_factor.encryption.abstract import AbstractEncryption
 
 
+@lru_cache(maxsize=8)
+def _derive_key(secret_key):
+    """
+    Derive a Fernet key from a (django) secret key.
+
+    :param secret_key: The secret key to derive from
+    :type secret_key: str
+
+    :return: The derived key
+    :rtype: bytes
+    """
+    digest = hashlib.md5(secret_key.encode())
+    return base64.urlsafe_b64encode(digest.hexdigest().encode())
+
+
+@lru_cache(maxsize=8)
+def _get_fernet(key):
+    """
+    Retrieve the Fernet suit for a key.
+
+    :param key: The key of the suit
+    :type key: bytes
+
+    :return: The Fernet suit
+    :rtype: cryptography.fernet.Fernet
+    """
+    return Fernet(key)
+
+
+@lru_cache(maxsize=8)
+def _get_multi_fernet(keys):
+    """
+    Retrieve the MultiFernet suit for multiple keys.
+
+    :param keys: The keys of the suit, the newest first
+    :type keys: tuple of bytes
+
+    :return: The MultiFernet suit
+    :rtype: cryptography.fernet.MultiFernet
+    """
+    return MultiFernet([_get_fernet(key) for key in keys])
+
+
 class AESEncryption(AbstractEncryption):
     """
     AES Encryption implementation.
 
     This implementation is basically a proxy
     to cryptography's Fernet suit.
+
+    The derived key and the Fernet suit are cached
+    per SECRET_KEY and invalidated if it changes.
     """
 
     @property
@@ -39,8 +89,17 @@ class AESEncryption(AbstractEncryption):
         :return: The key to use
         :rtype: bytes
         """
-        digest = hashlib.md5(settings.SECRET_KEY.encode())
-        return base64.urlsafe_b64encode(digest.hexdigest().encode())
+        return _derive_key(settings.SECRET_KEY)
+
+    @property
+    def fernet(self):
+        """
+        The (cached) Fernet suit for the current key.
+
+        :return: The Fernet suit to use
+        :rtype: cryptography.fernet.Fernet
+        """
+        return _get_fernet(self.key)
 
     def encrypt(self, secret):
         """
@@ -54,7 +113,7 @@ class AESEncryption(AbstractEncryption):
         :return: The encrypted value
         :rtype: bytes
         """
-        return Fernet(self.key).encrypt(secret)
+        return self.fernet.encrypt(secret)
 
     def decrypt(self, stored):
         """
@@ -68,4 +127,82 @@ class AESEncryption(AbstractEncryption):
         :return: The decrypted value
         :rtype: bytes
         """
-        return Fernet(self.key).decrypt(stored)
+        return self.fernet.decrypt(stored)
+
+    @classmethod
+    def clear_cache(cls):
+        """Clear the cached keys and Fernet suits."""
+        _derive_key.cache_clear()
+        _get_fernet.cache_clear()
+        _get_multi_fernet.cache_clear()
+
+
+class RotatingAESEncryption(AESEncryption):
+    """
+    AES Encryption with support for key rotation.
+
+    The keys are derived from the 'ENCRYPTION_KEYS' setting, the newest
+    first. Values are always encrypted with the newest key, but can be
+    decrypted with any of the keys. Values that are still encrypted with
+    an older key can be re-encrypted with the 'rotate_encryption_keys'
+    management command.
+    """
+
+    @property
+    def keys(self):
+        """
+        Keys to use for encryption/ decryption.
+
+        Falls back to the django SECRET_KEY if no keys are configured.
+
+        :return: The keys to use, the newest first
+        :rtype: tuple of bytes
+        """
+        secrets = multi_factor_settings.ENCRYPTION_KEYS or (
+            settings.SECRET_KEY,
+        )
+
+        return tuple(_derive_key(secret) for secret in secrets)
+
+    @property
+    def key(self):
+        """
+        Key to use for encryption.
+
+        :return: The newest key
+        :rtype: bytes
+        """
+        return self.keys[0]
+
+    @property
+    def fernet(self):
+        """
+        The (cached) MultiFernet suit for the current keys.
+
+        :return: The MultiFernet suit to use
+        :rtype: cryptography.fernet.MultiFernet
+        """
+        return _get_multi_fernet(self.keys)
+
+    def needs_rotation(self, stored):
+        """
+        Tell whether a stored value is encrypted with an older key.
+
+        :param stored: The encrypted stored value
+        :type stored: bytes
+
+        :return: Whether the value should be re-encrypted or not
+        :rtype: bool
+        """
+        try:
+            _get_fernet(self.key).decrypt(stored)
+
+        except InvalidToken:
+            return True
+
+        return False
+
+
+multi_factor_settings.listen(
+    AESEncryption.clear_cache, "SECRET_KEY", multi_factor_settings.namespace
+)
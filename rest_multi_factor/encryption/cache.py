@@ -0,0 +1,35 @@
+"""Per-process cache of decrypted secrets."""
+
+__all__ = (
+    "get_secret_cache",
+)
+
+from functools import lru_cache
+
+
+from rest_multi_factor.cache import LocalCache
+from rest_multi_factor.settings import multi_factor_settings
+
+
+@lru_cache(maxsize=1)
+def get_secret_cache():
+    """
+    Retrieve the cache for decrypted secrets.
+
+    The cache is configured with the 'ENCRYPTION_CACHE_SIZE' and
+    'ENCRYPTION_CACHE_TIMEOUT' settings and is disabled if the size
+    is zero.
+
+    :return: The cache to use or None if it's disabled
+    :rtype: rest_multi_factor.cache.LocalCache | None
+    """
+    size = multi_factor_settings.ENCRYPTION_CACHE_SIZE
+    timeout = multi_factor_settings.ENCRYPTION_CACHE_TIMEOUT
+
+    if not size:
+        return None
+
+    return LocalCache(size, timeout)
+
+
+multi_factor_settings.listen(get_secret_cache.cache_clear)
@@ -1,23 +1,227 @@
 """Customized django model fields."""
 
 __all__ = (
+    "Ciphertext",
     "EncryptedField",
+    "LazyDecryptionDescriptor",
 )
 
 from django.db.models.fields import CharField
+from django.db.models.signals import post_delete, post_save
 
+from rest_multi_factor.encryption.cache import get_secret_cache
 from rest_multi_factor.settings import multi_factor_settings
 
 
+class Ciphertext(bytes):
+    """The stored value of a lazy EncryptedField that isn't decrypted yet."""
+
+
+class LazyDecryptionDescriptor(object):
+    """
+    Descriptor for lazy encrypted fields.
+
+    Keeps the ciphertext that is loaded from the database and decrypts
+    it on first access. The decrypted value is cached on the instance
+    and, when enabled, in the per process secret cache.
+    """
+
+    def __init__(self, field):
+        """
+        Initialize the descriptor.
+
+        :param field: The field this descriptor belongs to
+        :type field: EncryptedField
+        """
+        self.field = field
+
+    def __get__(self, instance, cls=None):
+        """
+        Retrieve the (decrypted) value.
+
+        :param instance: The model instance
+        :type instance: django.db.models.base.Model | None
+
+        :param cls: The model class
+        :type cls: type of django.db.models.base.Model
+
+        :return: The decrypted value or the descriptor for class access
+        :rtype: bytes | LazyDecryptionDescriptor
+        """
+        if instance is None:
+            return self
+
+        data = instance.__dict__
+        name = self.field.attname
+
+        # deferred fields are loaded the same way as django does
+        if name not in data:
+            instance.refresh_from_db(fields=[name])
+
+        value = data[name]
+        if isinstance(value, Ciphertext):
+            value = data[name] = self.field.decrypt(value, instance)
+
+        return value
+
+    def __set__(self, instance, value):
+        """
+        Set a (plain or encrypted) value.
+
+        :param instance: The model instance
+        :type instance: django.db.models.base.Model
+
+        :param value: The value to set
+        :type value: bytes | Ciphertext
+        """
+        instance.__dict__[self.field.attname] = value
+
+
 class EncryptedField(CharField):
     """
     Encrypting field.
 
     Encrypts the data before inserting it into the
     database and decrypts it on retrieval.
+
+    Lazy fields will only decrypt the data on first access of
+    the model attribute. Note that for lazy fields `values()` and
+    `values_list()` will return the stored `Ciphertext` instead.
     """
 
-    _encryption = multi_factor_settings.DEFAULT_ENCRYPTION_CLASS()
+    def __init__(self, *args, lazy=False, **kwargs):
+        """
+        Initialize the field.
+
+        :param lazy: Whether to decrypt on first access or on retrieval
+        :type lazy: bool
+        """
+        self.lazy = lazy
+        super().__init__(*args, **kwargs)
+
+    @property
+    def encryption(self):
+        """
+        The encryption handler to use.
+
+        :return: An instance of the configured encryption class
+        :rtype: rest_multi_factor.encryption.abstract.AbstractEncryption
+        """
+        return multi_factor_settings.DEFAULT_ENCRYPTION_CLASS()
+
+    def contribute_to_class(self, cls, name, *args, **kwargs):
+        """
+        Add the field to a model.
+
+        Lazy fields replace the default attribute of the model with
+        a descriptor that decrypts on first access.
+
+        :param cls: The model class
+        :type cls: type of django.db.models.base.Model
+
+        :param name: The name of the field
+        :type name: str
+        """
+        super().contribute_to_class(cls, name, *args, **kwargs)
+
+        if self.lazy:
+            setattr(cls, self.attname, LazyDecryptionDescriptor(self))
+
+            if not cls._meta.abstract:
+                post_save.connect(self.clear_cache, sender=cls)
+                post_delete.connect(self.clear_cache, sender=cls)
+
+    def get_cache_key(self, instance):
+        """
+        Retrieve the key of an instance in the secret cache.
+
+        :param instance: The model instance
+        :type instance: django.db.models.base.Model
+
+        :return: The cache key
+        :rtype: tuple
+        """
+        return self.model._meta.label, instance.pk, self.attname
+
+    def clear_cache(self, instance, **_):
+        """
+        Remove the decrypted value of an instance from the secret cache.
+
+        This is connected to the post_save and post_delete signals
+        of the model.
+
+        :param instance: The model instance
+        :type instance: django.db.models.base.Model
+        """
+        cache = get_secret_cache()
+
+        if cache is not None:
+            cache.delete(self.get_cache_key(instance))
+
+    def decrypt(self, value, instance):
+        """
+        Decrypt the value of a lazy field through the secret cache.
+
+        Cached values are only used when the stored ciphertext is
+        still the same, so changes that bypass the model signals
+        like `QuerySet.update()` are never served stale.
+
+        :param value: The ciphertext to decrypt
+        :type value: Ciphertext
+
+        :param instance: The model instance the value belongs to
+        :type instance: django.db.models.base.Model
+
+        :return: The decrypted data
+        :rtype: bytes
+        """
+        cache = get_secret_cache()
+
+        if cache is None or instance.pk is None:
+            return self.to_python(value)
+
+        key = self.get_cache_key(instance)
+        cached = cache.get(key)
+
+        if cached is not None and cached[0] == value:
+            return cached[1]
+
+        decrypted = self.to_python(value)
+        cache.set(key, (bytes(value), decrypted))
+
+        return decrypted
+
+    def deconstruct(self):
+        """
+        Deconstruct the field for migrations.
+
+        :return: The name, path, arguments and keyword arguments
+        :rtype: tuple
+        """
+        name, path, args, kwargs = super().deconstruct()
+
+        if self.lazy:
+            kwargs["lazy"] = True
+
+        return name, path, args, kwargs
+
+    def pre_save(self, model_instance, add):
+        """
+        Retrieve the value to save without decrypting lazy fields.
+
+        :param model_instance: The instance that is being saved
+        :type model_instance: django.db.models.base.Model
+
+        :param add: Whether the instance is being added or not
+        :type add: bool
+
+        :return: The (plain or encrypted) value to save
+        :rtype: bytes | Ciphertext
+        """
+        if self.lazy and self.attname in model_instance.__dict__:
+            return model_instance.__dict__[self.attname]
+
+        return super().pre_save(model_instance, add)
 
     def to_python(self, value):
         """
@@ -29,7 +233,7 @@ class EncryptedField(CharField):
         :return: The decrypted data
         :rtype: bytes
         """
-        return self._encryption.decrypt(value)
+        return self.encryption.decrypt(value)
 
     def from_db_value(self, value, *_):
         """
@@ -38,23 +242,31 @@ class EncryptedField(CharField):
         :param value: The value to decrypt
         :type value: bytes | str
 
-        :return: The decrypted data
-        :rtype: bytes
+        :return: The decrypted data or the ciphertext for lazy fields
+        :rtype: bytes | Ciphertext
         """
         # django 2.x compat
         if isinstance(value, str):  # pragma: no cover
             value = value.encode()
 
+        if self.lazy:
+            return Ciphertext(value)
+
         return self.to_python(value)
 
     def get_prep_value(self, value):
         """
         Encrypt the data for the database.
 
+        Values that are never decrypted are stored as they are.
+
         :param value: The value to encrypt
-        :type value: bytes
+        :type value: bytes | Ciphertext
 
         :return: The encrypted data
-        :rtype: bytes
+        :rtype: str
         """
-        return self._encryption.encrypt(value).decode()
+        if isinstance(value, Ciphertext):
+            return value.decode()
+
+        return self.encryption.encrypt(value).decode()
@@ -0,0 +1 @@
+"""Management commands for the REST Multi Factor app."""
@@ -0,0 +1 @@
+"""Management commands of the REST Multi Factor app."""
@@ -0,0 +1,178 @@
+"""Command to re-encrypt encrypted fields with the newest key."""
+
+__all__ = (
+    "Command",
+)
+
+import time
+
+from django import VERSION
+from django.apps import apps
+from django.db.models.fields import CharField
+from django.db.models.functions import Cast
+from django.core.management.base import BaseCommand, CommandError
+
+
+from rest_multi_factor.fields import EncryptedField
+from rest_multi_factor.settings import multi_factor_settings
+
+
+class Command(BaseCommand):
+    """
+    Re-encrypt all values that are encrypted with an older key.
+
+    The rows are streamed in batches and only the rows that are still
+    encrypted with an older key are updated, so the command can safely
+    be (re)started while the application is running.
+    """
+
+    help = "Re-encrypt encrypted fields that still use an older key."
+
+    def add_arguments(self, parser):
+        """
+        Add the arguments of the command.
+
+        :param parser: The argument parser
+        :type parser: argparse.ArgumentParser
+        """
+        parser.add_argument(
+            "--batch-size", type=int, default=500,
+            help="The number of rows to read and update at once.",
+        )
+
+    def handle(self, *args, **options):
+        """
+        Execute the command.
+
+        :raises django.core.management.base.CommandError: If the rotation
+        isn't supported.
+        """
+        if VERSION < (2, 2):  # pragma: no cover
+            raise CommandError("Key rotation requires django 2.2 or higher")
+
+        encryption = multi_factor_settings.DEFAULT_ENCRYPTION_CLASS()
+        if not hasattr(encryption, "needs_rotation"):
+            raise CommandError(
+                "'{0}' doesn't support key rotation, configure a rotating "
+                "'DEFAULT_ENCRYPTION_CLASS' first."
+                .format(encryption.__class__.__name__)
+            )
+
+        for model, fields in self.get_encrypted_models():
+            self.rotate(model, fields, encryption, options["batch_size"])
+
+    def get_encrypted_models(self):
+        """
+        Retrieve all models with encrypted fields.
+
+        :return: The models and their encrypted fields
+        :rtype: generator of tuple
+        """
+        for model in apps.get_models():
+            fields = tuple(
+                f for f in getattr(model, "_meta").concrete_fields
+                if isinstance(f, EncryptedField)
+            )
+
+            if fields:
+                yield model, fields
+
+    def rotate(self, model, fields, encryption, batch_size):
+        """
+        Re-encrypt the encrypted fields of a single model.
+
+        The values are selected as text, so they aren't decrypted
+        for rows that are already encrypted with the newest key.
+
+        :param model: The model to rotate the keys for
+        :type model: type of django.db.models.base.Model
+
+        :param fields: The encrypted fields of the model
+        :type fields: tuple of rest_multi_factor.fields.EncryptedField
+
+        :param encryption: The encryption handler to use
+        :type encryption: rest_multi_factor.encryption.RotatingAESEncryption
+
+        :param batch_size: The number of rows to handle at once
+        :type batch_size: int
+        """
+        label = getattr(model, "_meta").label
+        names = tuple(f.attname for f in fields)
+
+        queryset = model._default_manager.order_by("pk").annotate(**{
+            "_{0}".format(name): Cast(name, CharField()) for name in names
+        }).values_list("pk", *("_{0}".format(name) for name in names))
+
+        total = queryset.count()
+        started = time.time()
+
+        batch = []
+        checked = rotated = 0
+
+        for pk, *stored in queryset.iterator(chunk_size=batch_size):
+            checked += 1
+
+            stored = tuple(s.encode() if s is not None else s for s in stored)
+            if not any(s and encryption.needs_rotation(s) for s in stored):
+                continue
+
+            batch.append(model(pk=pk, **{
+                name: encryption.decrypt(s) if s is not None else s
+                for name, s in zip(names, stored)
+            }))
+
+            if len(batch) >= batch_size:
+                rotated += self.update(model, batch, names)
+                self.report(label, checked, total, rotated, started)
+
+                batch = []
+
+        rotated += self.update(model, batch, names)
+        self.report(label, checked, total, rotated, started)
+
+    def update(self, model, batch, names):
+        """
+        Write a batch of re-encrypted instances.
+
+        :param model: The model of the instances
+        :type model: type of django.db.models.base.Model
+
+        :param batch: The instances to update
+        :type batch: list of django.db.models.base.Model
+
+        :param names: The names of the fields to update
+        :type names: tuple of str
+
+        :return: The number of updated instances
+        :rtype: int
+        """
+        if batch:
+            model._default_manager.bulk_update(batch, names)
+
+        return len(batch)
+
+    def report(self, label, checked, total, rotated, started):
+        """
+        Report the progress and throughput of the rotation.
+
+        :param label: The label of the current model
+        :type label: str
+
+        :param checked: The number of checked rows
+        :type checked: int
+
+        :param total: The total number of rows
+        :type total: int
+
+        :param rotated: The number of re-encrypted rows
+        :type rotated: int
+
+        :param started: The timestamp the rotation of the model started
+        :type started: float
+        """
+        elapsed = max(time.time() - started, 1e-6)
+
+        self.stdout.write(
+            "{0}: {1}/{2} rows checked, {3} re-encrypted ({4:.0f} rows/s)"
+            .format(label, checked, total, rotated, checked / elapsed)
+        )
@@ -0,0 +1,29 @@
+from django.db import migrations
+from django.db.models.deletion import CASCADE
+from django.db.models.fields import PositiveIntegerField
+from django.db.models.fields.related import OneToOneField
+
+
+from rest_multi_factor.settings import multi_factor_settings
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        (multi_factor_settings.AUTH_TOKEN_MODEL.split(".")[0], "__first__"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="VerificationCounter",
+            fields=[
+                ("token", OneToOneField(
+                    on_delete=CASCADE, primary_key=True, related_name="+",
+                    serialize=False, to=multi_factor_settings.AUTH_TOKEN_MODEL
+                )),
+                ("confirmed", PositiveIntegerField(default=0)),
+            ],
+        ),
+    ]
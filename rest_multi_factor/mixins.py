@@ -12,6 +12,7 @@ from rest_framework.exceptions import NotFound
 
 from rest_multi_factor.utils import get_subclassed_models
 from rest_multi_factor.models import Device
+from rest_multi_factor.queries import confirmed_indexes, device_indexes
 
 from rest_multi_factor.containers import GeneralDeviceContainer
 from rest_multi_factor.containers import SpecificDeviceContainer
@@ -88,20 +89,70 @@ class DeviceMixin(object):
         :return: The available devices
         :rtype: tuple
         """
+        bitmap = self.get_user_device_bitmap(user)
+        devices = self.get_devices()
+
         if fill:
             devices = (
-                d if d.objects.filter(user=user).exists() else None
-                for d in self.get_devices()
+                d if bitmap & (1 << i) else None
+                for i, d in enumerate(devices)
             )
 
         else:
             devices = (
-                d for d in self.get_devices()
-                if d.objects.filter(user=user).exists()
+                d for i, d in enumerate(devices)
+                if bitmap & (1 << i)
             )
 
         return tuple(devices)
 
+    def get_user_device_bitmap(self, user):
+        """
+        Get the presence of every device for this user at once.
+
+        All device tables are queried with a single prepared UNION
+        query that only selects the index of the device.
+
+        :param user: The current user instance
+        :type user: django.contrib.auth.models.AbstractBaseUser
+
+        :return: A bitmap with bit n set if the user owns device n
+        :rtype: int
+        """
+        return self.get_bitmap(device_indexes.execute(user=user))
+
+    def get_user_confirmations(self, request):
+        """
+        Get the confirmation state of every device for this token at once.
+
+        All challenge tables are queried with a single read only UNION
+        query, missing challenges are treated as unconfirmed.
+
+        :param request: The current request instance
+        :type request: rest_framework.request.Request
+
+        :return: A bitmap with bit n set if the challenge of device n
+                 is confirmed for the current token
+        :rtype: int
+        """
+        return self.get_bitmap(confirmed_indexes.execute(token=request.auth))
+
+    def get_bitmap(self, rows):
+        """
+        Build a bitmap from the rows of a labeled unified query.
+
+        :param rows: Rows with the index as the first column
+        :type rows: list of tuple
+
+        :return: A bitmap with bit n set if index n was found
+        :rtype: int
+        """
+        bitmap = 0
+        for row in rows:
+            bitmap |= 1 << row[0]
+
+        return bitmap
+
     @lru_cache(1)
     def get_prepared_devices(self):
         """
@@ -128,18 +179,22 @@ class DeviceMixin(object):
         :rtype: tuple
         """
         devices = self.get_user_devices(request.user, fill=True)
+        confirmed = self.get_user_confirmations(request)
 
         return tuple(
-            self.prepare_specific(request, devices[i], i)
+            self.prepare_specific(
+                request, devices[i], i, bool(confirmed & (1 << i))
+            )
             for i in range(0, len(devices)) if devices[i] is not None
         )
 
-    def prepare_specific(self, request, device, index):
+    def prepare_specific(self, request, device, index, confirmed=None):
         """
         Prepare a more detailed response.
 
         Extracts the general and user specific meta data
-        from a device and put it into a container.
+        from a device and put it into a container. This is read
+        only, challenges are only created when verifying or dispatching.
 
         :param request: The current request instance
         :type request: rest_framework.request.Request
@@ -150,16 +205,17 @@ class DeviceMixin(object):
         :param index: The identifier of this device
         :type index: int
 
+        :param confirmed: Whether the challenge is confirmed, when omitted
+                          it's retrieved from the database
+        :type confirmed: bool | None
+
         :return: A container with the distributed info of a device
         :rtype: rest_multi_factor.containers.DeviceContainer
         """
-        token = request.auth
-        instance = device.objects.get(user=request.user)
-
-        challenge = device.challenge.objects.get_or_create(
-            device=instance, token=token
-        )[0]
-        confirmed = challenge.confirm
+        if confirmed is None:
+            confirmed = device.challenge.objects.filter(
+                device__user=request.user, token=request.auth, confirm=True
+            ).exists()
 
         return SpecificDeviceContainer(
             index, confirmed, device.verbose_name, device.dispatchable
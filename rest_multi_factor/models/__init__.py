@@ -8,7 +8,9 @@ one time passwords and pre-shared secrets.
 
 __all__ = (
     "Device",
-    "Challenge"
+    "Challenge",
+    "VerificationCounter",
 )
 
 from rest_multi_factor.models.base import Challenge, Device
+from rest_multi_factor.models.counters import VerificationCounter
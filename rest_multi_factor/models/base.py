@@ -52,3 +52,28 @@ class Challenge(Model, ChallengeMixin):
     token = OneToOneField(Token, on_delete=CASCADE)
 
     confirm = BooleanField(default=False)
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """
+        Create a instance from a database row.
+
+        Overridden to remember the stored confirmation, so the signal
+        receivers can tell when a challenge is confirmed.
+
+        :param db: The alias of the database
+        :type db: str
+
+        :param field_names: The names of the loaded fields
+        :type field_names: list of str
+
+        :param values: The loaded values
+        :type values: list
+
+        :return: The loaded instance
+        :rtype: Challenge
+        """
+        instance = super().from_db(db, field_names, values)
+        instance._stored_confirm = instance.__dict__.get("confirm", False)
+
+        return instance
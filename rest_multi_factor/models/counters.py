@@ -0,0 +1,31 @@
+"""Denormalized state of the verifications."""
+
+__all__ = (
+    "VerificationCounter",
+)
+
+from django.db.models.base import Model
+from django.db.models.deletion import CASCADE
+from django.db.models.fields import PositiveIntegerField
+from django.db.models.fields.related import OneToOneField
+
+
+from rest_multi_factor.utils import get_token_model
+
+
+Token = get_token_model()
+
+
+class VerificationCounter(Model):
+    """
+    The number of confirmed challenges of a token.
+
+    This model is maintained by the CounterBackend, so checking the
+    verification state is a primary key lookup.
+    """
+
+    token = OneToOneField(
+        Token, on_delete=CASCADE, primary_key=True, related_name="+"
+    )
+
+    confirmed = PositiveIntegerField(default=0)
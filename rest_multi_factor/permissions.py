@@ -6,18 +6,53 @@ __all__ = (
     "IsVerifiedOrNoDevice"
 )
 
-from django import VERSION
-from django.db.models.query import Q
+import logging
+
+from functools import wraps
 
 
 from rest_framework.permissions import BasePermission
 
 
-from rest_multi_factor.utils import unify_queryset
-from rest_multi_factor.models import Device
+from rest_multi_factor.utils import QueryCounter
+from rest_multi_factor.queries import user_devices
 from rest_multi_factor.settings import multi_factor_settings
 
 
+logger = logging.getLogger(__name__)
+
+
+def instrumented(method):
+    """
+    Log the number of queries of a permission check.
+
+    The queries are only counted when debug logging is enabled
+    for this module.
+
+    :param method: The `has_permission` method to instrument
+    :type method: callable
+
+    :return: The instrumented method
+    :rtype: callable
+    """
+    @wraps(method)
+    def wrapper(self, request, view):
+        if not logger.isEnabledFor(logging.DEBUG):
+            return method(self, request, view)
+
+        with QueryCounter() as counter:
+            result = method(self, request, view)
+
+        logger.debug(
+            "%s.has_permission executed %d queries",
+            type(self).__name__, counter.count
+        )
+
+        return result
+
+    return wrapper
+
+
 class IsTokenAuthenticated(BasePermission):
     """
     Permission that requires token authentication.
@@ -54,10 +89,14 @@ class IsVerified(IsTokenAuthenticated):
 
     backend_class = multi_factor_settings.DEFAULT_BACKEND_CLASS
 
+    @instrumented
     def has_permission(self, request, view):
         """
         Tell whether or not the user has a verified API token.
 
+        The token authentication is checked before the backend
+        so other requests don't cost any queries.
+
         :param request: The current request instance
         :type request: rest_framework.request.Request
 
@@ -67,13 +106,11 @@ class IsVerified(IsTokenAuthenticated):
         :return: Whether permission is granted or not
         :rtype: bool
         """
-        backend = self.get_backend()
-        counted = backend.verify(request.auth, view)
+        if not IsTokenAuthenticated.has_permission(self, request, view):
+            return False
 
-        return (
-            IsTokenAuthenticated.has_permission(self, request, view)
-            and counted == 0
-        )
+        backend = self.get_backend()
+        return backend.verify(request.auth, view) == 0
 
     def get_backend(self):
         """
@@ -100,10 +137,14 @@ class IsVerifiedOrNoDevice(IsVerified):
     first time requirement of multi factor.
     """
 
+    @instrumented
     def has_permission(self, request, view):
         """
         Tell whether or not the user has permission.
 
+        For token authenticated requests the backend answers whether
+        the token is verified and whether the user has devices at once.
+
         :param request: The current request instance
         :type request: rest_framework.request.Request
 
@@ -113,10 +154,18 @@ class IsVerifiedOrNoDevice(IsVerified):
         :return: Whether permission is granted or not
         :rtype: bool
         """
-        return (
-                IsVerified.has_permission(self, request, view)
-                or not self.has_devices(request.user)
-        )
+        user = request.user
+
+        if not (user and user.is_authenticated):
+            return False
+
+        if request.auth is None:
+            return not self.has_devices(user)
+
+        backend = self.get_backend()
+        state = backend.get_state(request.auth, user, view)
+
+        return state.left == 0 or not state.devices
 
     def has_devices(self, user):
         """
@@ -128,10 +177,4 @@ class IsVerifiedOrNoDevice(IsVerified):
         :return: Whether the current user has devices or not
         :rtype: bool
         """
-        queryset = unify_queryset(Device, ("id",), Q(user=user))
-
-        # ticket: https://code.djangoproject.com/ticket/28399
-        if VERSION < (1, 11, 4):
-            return bool(len(queryset))  # pragma: no cover
-
-        return bool(queryset.count())   # pragma: no cover
+        return bool(user_devices.execute(user=user))
@@ -10,6 +10,7 @@ import base64
 import binascii
 import urllib.parse
 
+from django.db import transaction
 from django.db.models.fields import BigIntegerField
 from django.db.models.fields.related import CASCADE, ForeignKey
 
@@ -33,7 +34,7 @@ class HOTPDevice(Device):
     """
 
     secret = EncryptedField(
-        max_length=255, editable=False, default=_generate_secret
+        max_length=255, editable=False, default=_generate_secret, lazy=True
     )
 
     counter = BigIntegerField(default=0)
@@ -87,6 +88,10 @@ class HOTPChallenge(Challenge):
         """
         Verify a one time password with the HOTP algorithm.
 
+        The counter is advanced even when the result isn't saved, so
+        callers that save it themselves should verify and save within
+        one transaction.
+
         :param value:: The HOTP token to verify
         :type value: str | int
 
@@ -99,32 +104,52 @@ class HOTPChallenge(Challenge):
         if self.confirm:  # noqa: no cover
             raise RuntimeError("This challenge is already confirmed")
 
-        try:
-            value = int(value)
-
-        except (TypeError, ValueError):  # noqa: no cover
-            return False
-
         digits = multi_factor_settings.HOTP_DIGITS
         digest = multi_factor_settings.HOTP_ALGORITHM
+        tolerance = multi_factor_settings.HOTP_TOLERANCE
 
         counter = self.device.counter
+        matched = HOTPAlgorithm().verify_window(
+            self.device.secret, value,
+            range(counter, counter + tolerance + 1), digits, digest
+        )
 
-        algorithm = HOTPAlgorithm()
-        tolerance = multi_factor_settings.HOTP_TOLERANCE
+        if matched is None:
+            return False
+
+        if not save:
+            return self.advance(matched)
+
+        with transaction.atomic(using=self._state.db):
+            if not self.advance(matched):
+                return False
 
-        for offset in range(counter, counter + tolerance + 1):
-            tryout = algorithm.calculate(
-                self.device.secret, offset, digits, digest
-            )
+            self.save()
 
-            if tryout == value:
-                self.confirm = True
-                self.device.counter += 1
+        return True
 
-                if save:
-                    self.save()
+    def advance(self, matched):
+        """
+        Advance the counter of the device past a matched counter.
+
+        The counter is advanced with a single conditional UPDATE instead
+        of a read-modify-write, so of concurrent verifications of the
+        same password only one advances the counter and succeeds.
+
+        :param matched: The counter that matched the password
+        :type matched: int
+
+        :return: Whether the counter was advanced
+        :rtype: bool
+        """
+        queryset = HOTPDevice.objects.filter(
+            pk=self.device.pk, counter__lte=matched
+        )
+
+        if not queryset.update(counter=matched + 1):
+            return False
 
-                return True
+        self.confirm = True
+        self.device.counter = matched + 1
 
-        return False
+        return True
@@ -1,12 +1,20 @@
 """Tests for HOTP logic."""
 
+from unittest.mock import patch
+
+from django.db import IntegrityError, connection
+from django.core.cache import cache
+from django.test.utils import CaptureQueriesContext
 from rest_framework.test import APITestCase
 
 from rest_multi_factor.algorithms import HOTPAlgorithm
+from rest_multi_factor.viewsets import MultiFactorVerifierViewSet
 from rest_multi_factor.factories.user import UserFactory
 from rest_multi_factor.factories.auth import AuthFactory
 from rest_multi_factor.plugins.hotp.models import HOTPDevice
 
+from tests.utils import count_queries, verify_device
+
 
 class VerificationTests(APITestCase):
     """Tests for HOTP verification implementation."""
@@ -44,3 +52,68 @@ class VerificationTests(APITestCase):
 
             self.assertFalse(confirmed, description)
             self.device.counter = 0
+
+    def test_counter_advance(self):
+        """Test that the counter is persisted and can't be replayed."""
+        calculated = self.algorithm.calculate(self.device.secret, 1)
+
+        stale = HOTPDevice.objects.get(pk=self.device.pk)
+        other = HOTPDevice.challenge(device=stale, confirm=False)
+
+        self.assertTrue(self.relate.verify(calculated))
+
+        device = HOTPDevice.objects.get(pk=self.device.pk)
+        relate = HOTPDevice.challenge.objects.get(pk=self.relate.pk)
+
+        self.assertEqual(device.counter, 2)
+        self.assertTrue(relate.confirm)
+
+        # a concurrent verification with the same password
+        self.assertFalse(other.verify(calculated, save=False))
+        self.assertEqual(stale.counter, 0)
+
+        self.relate.confirm = False
+        self.relate.save()
+
+        self.device.counter = 0
+        self.device.save()
+
+
+class ViewSetTests(APITestCase):
+    """Tests for verifying through the verifier viewset."""
+
+    def setUp(self):
+        """Set up the test data within the test db."""
+        cache.clear()
+
+        self.user = UserFactory()
+        self.auth = AuthFactory(user=self.user)
+
+        self.device = HOTPDevice.objects.create(user=self.user)
+        self.value = HOTPAlgorithm().calculate(self.device.secret, 0)
+
+    def test_verification_queries(self):
+        """
+        Test the queries of a verification, the device with the challenge,
+        the counter update, the count and the insert.
+        """
+        with CaptureQueriesContext(connection) as context:
+            response = verify_device(
+                self.device, self.value, self.user, self.auth
+            )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(count_queries(context.captured_queries), 4)
+
+    def test_verification_rollback(self):
+        """Test that the counter isn't advanced when storing fails."""
+        with patch.object(MultiFactorVerifierViewSet, "save_challenge",
+                          side_effect=IntegrityError):
+            response = verify_device(
+                self.device, self.value, self.user, self.auth
+            )
+
+        self.device.refresh_from_db()
+
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(self.device.counter, 0)
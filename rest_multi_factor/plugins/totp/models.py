@@ -10,6 +10,7 @@ import base64
 import binascii
 import urllib.parse
 
+from django.core.cache import cache as default_cache
 from django.db.models.deletion import CASCADE
 from django.db.models.fields.related import ForeignKey
 
@@ -32,7 +33,7 @@ class TOTPDevice(Device):
     """
 
     secret = EncryptedField(
-        max_length=255, editable=False, default=_generate_secret
+        max_length=255, editable=False, default=_generate_secret, lazy=True
     )
 
     @property
@@ -86,10 +87,23 @@ class TOTPChallenge(Challenge):
     device = ForeignKey(TOTPDevice, on_delete=CASCADE, editable=False)
     dispatch = None
 
+    # stores the accepted steps of the devices
+    cache = default_cache
+
     def verify(self, value, save=True):
         """
         Validate a token to check if this challenge can be confirmed.
 
+        Every step is only accepted once per device, steps at or before
+        the last accepted step are skipped without calculating them.
+
+        This takes two cache operations, a read of the accepted steps
+        and an atomic add() that claims the matched step. The claim is
+        what guarantees that a step is accepted once. Django's cache has
+        no compare-and-set to atomically raise a single last step per
+        device, so concurrent verifications of different steps can both
+        succeed in any order, but never with the same step.
+
         :param value: The TOTP token to verify
         :type value: str | int
 
@@ -102,29 +116,77 @@ class TOTPChallenge(Challenge):
         if self.confirm:  # noqa: no cover
             raise RuntimeError("This challenge is already confirmed")
 
-        try:
-            value = int(value)
-
-        except (TypeError, ValueError):  # noqa: no cover
-            return False
-
         period = multi_factor_settings.TOTP_PERIOD
         digits = multi_factor_settings.TOTP_DIGITS
         digest = multi_factor_settings.TOTP_ALGORITHM
+        tolerance = multi_factor_settings.TOTP_TOLERANCE
 
         algorithm = TOTPAlgorithm()
-        tolerance = multi_factor_settings.TOTP_TOLERANCE
+        keyed = algorithm.bind(self.device.secret, period, 0, digits, digest)
+
+        window = keyed.get_window(tolerance)
+        last = self.get_last_step(window)
 
-        for offset in range(-tolerance, tolerance+1):
-            tryout = algorithm.calculate(
-                self.device.secret, period, 0, digits, offset, digest
-            )
+        # skip the steps up to the last accepted step
+        if last is not None:
+            window = window[window.index(last) + 1:]
 
-            if tryout == value:
-                self.confirm = True
-                if save:
-                    self.save()
+        matched = keyed.verify_steps(value, window, algorithm.constant_time)
 
-                return True
+        if matched is None:
+            return False
+
+        # a step stays within the window for at most this long
+        timeout = period * (2 * tolerance + 1)
+
+        if not self.claim_step(matched, timeout):
+            return False
+
+        self.confirm = True
+        if save:
+            self.save()
+
+        return True
+
+    def get_last_step(self, window):
+        """
+        Get the last accepted step of the device within a window.
 
-        return False
+        :param window: The steps of the window
+        :type window: range
+
+        :return: The last accepted step or None if there isn't any
+        :rtype: int | None
+        """
+        keys = [self.get_step_key(step) for step in window]
+        return max(self.cache.get_many(keys).values(), default=None)
+
+    def claim_step(self, step, timeout):
+        """
+        Claim a step of the device.
+
+        The step is claimed with a single atomic add, so of concurrent
+        verifications of the same step only one succeeds.
+
+        :param step: The step to claim
+        :type step: int
+
+        :param timeout: The number of seconds to keep the claim
+        :type timeout: int
+
+        :return: Whether the step was claimed
+        :rtype: bool
+        """
+        return self.cache.add(self.get_step_key(step), step, timeout)
+
+    def get_step_key(self, step):
+        """
+        Get the cache key of a step of the device.
+
+        :param step: The step to get the key for
+        :type step: int
+
+        :return: The cache key
+        :rtype: str
+        """
+        return urllib.parse.quote("totp {0} {1}".format(self.device_id, step))
@@ -1,5 +1,10 @@
 """Tests for TOTP logic."""
 
+from unittest.mock import Mock, patch
+
+from django.db import connection
+from django.core.cache import cache
+from django.test.utils import CaptureQueriesContext
 from rest_framework.test import APITestCase
 
 from rest_multi_factor.algorithms import TOTPAlgorithm
@@ -7,6 +12,8 @@ from rest_multi_factor.factories.user import UserFactory
 from rest_multi_factor.factories.auth import AuthFactory
 from rest_multi_factor.plugins.totp.models import TOTPDevice
 
+from tests.utils import count_queries, verify_device
+
 
 class VerificationTests(APITestCase):
     """Tests for TOTP verification implementation."""
@@ -24,6 +31,10 @@ class VerificationTests(APITestCase):
 
         cls.algorithm = TOTPAlgorithm()
 
+    def setUp(self):
+        """Forget the accepted steps of earlier tests."""
+        cache.clear()
+
     def test_successful_verification(self):
         """
         Test a all successful scenario's for TOTP validation.
@@ -57,3 +68,58 @@ class VerificationTests(APITestCase):
             self.assertFalse(confirmed, description)
 
             self.relate.confirm = False
+
+    def test_replayed_verification(self):
+        """Test that accepted steps and steps before them are rejected."""
+        current = self.algorithm.calculate(self.device.secret, drift=0)
+        previous = self.algorithm.calculate(self.device.secret, drift=-1)
+
+        self.assertTrue(self.relate.verify(current, save=False))
+        self.relate.confirm = False
+
+        other = TOTPDevice.challenge(device=self.device, confirm=False)
+
+        self.assertFalse(other.verify(current, save=False))
+        self.assertFalse(other.verify(previous, save=False))
+
+        following = self.algorithm.calculate(self.device.secret, drift=1)
+        self.assertTrue(other.verify(following, save=False))
+
+    def test_cache_operations(self):
+        """Test that a verification reads once and claims atomically."""
+        current = self.algorithm.calculate(self.device.secret, drift=0)
+
+        with patch.object(TOTPDevice.challenge, "cache",
+                          Mock(wraps=cache)) as mock:
+            self.assertTrue(self.relate.verify(current, save=False))
+
+        self.relate.confirm = False
+
+        self.assertEqual(mock.get_many.call_count, 1)
+        self.assertEqual(mock.add.call_count, 1)
+        self.assertEqual(len(mock.method_calls), 2)
+
+
+class ViewSetTests(APITestCase):
+    """Tests for verifying through the verifier viewset."""
+
+    def setUp(self):
+        """Set up the test data within the test db."""
+        cache.clear()
+
+        self.user = UserFactory()
+        self.auth = AuthFactory(user=self.user)
+
+    def test_verification_queries(self):
+        """
+        Test the queries of a verification, the device with the challenge,
+        the count and the insert.
+        """
+        device = TOTPDevice.objects.create(user=self.user)
+        value = TOTPAlgorithm().calculate(device.secret)
+
+        with CaptureQueriesContext(connection) as context:
+            response = verify_device(device, value, self.user, self.auth)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(count_queries(context.captured_queries), 3)
@@ -0,0 +1,104 @@
+"""Prepared queries for the verification state of tokens and users."""
+
+__all__ = (
+    "user_devices",
+    "device_indexes",
+    "confirmed_indexes",
+    "verification_state",
+    "confirmed_challenges",
+)
+
+from django.db.models.query import Q
+
+
+from rest_multi_factor.utils import (
+    PreparedQuery,
+    unify_queryset,
+    get_subclassed_models,
+    filter_subclassed_models,
+)
+from rest_multi_factor.models import Challenge, Device
+
+
+def confirmed(token):
+    """
+    Build the filter for the confirmed challenges of a token.
+
+    :param token: The token or a placeholder for it
+    :type token: rest_framework.authtoken.Token | any
+
+    :return: The filter
+    :rtype: django.db.models.query.Q
+    """
+    return Q(token=token) & Q(confirm=True)
+
+
+def build_confirmed_indexes(token):
+    """
+    Build the query for the indexes of the confirmed challenges.
+
+    The index of a challenge is the index of its device.
+
+    :param token: The placeholder for the token
+    :type token: any
+
+    :return: The unified queryset
+    :rtype: django.db.models.query.QuerySet
+    """
+    models = tuple(d.challenge for d in get_subclassed_models(Device))
+
+    return unify_queryset(
+        Challenge, (), confirmed(token), label="index", models=models
+    )
+
+
+def build_verification_state(token, user):
+    """
+    Build the query for the confirmed challenges and devices at once.
+
+    Challenges are labeled with the indexes below the number of
+    challenge models, devices with the indexes after that.
+
+    :param token: The placeholder for the token
+    :type token: any
+
+    :param user: The placeholder for the user
+    :type user: any
+
+    :return: The unified queryset
+    :rtype: django.db.models.query.QuerySet
+    """
+    challenges = filter_subclassed_models(
+        Challenge, (), confirmed(token), label="index"
+    )
+    devices = filter_subclassed_models(
+        Device, (), Q(user=user), label="index", start=len(challenges)
+    )
+
+    first, *others = challenges + devices
+    return first.union(*others, all=True)
+
+
+# the ids of the confirmed challenges of a token
+confirmed_challenges = PreparedQuery(
+    lambda token: unify_queryset(Challenge, ("id",), confirmed(token)),
+    "token",
+)
+
+# the ids of the devices of a user
+user_devices = PreparedQuery(
+    lambda user: unify_queryset(Device, ("id",), Q(user=user)),
+    "user",
+)
+
+# the indexes of the devices of a user
+device_indexes = PreparedQuery(
+    lambda user: unify_queryset(Device, (), Q(user=user), label="index"),
+    "user",
+)
+
+# the indexes of the devices with a confirmed challenge for a token
+confirmed_indexes = PreparedQuery(build_confirmed_indexes, "token")
+
+# the labeled confirmed challenges of a token and the devices of its user
+verification_state = PreparedQuery(build_verification_state, "token", "user")
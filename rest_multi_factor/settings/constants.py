@@ -15,11 +15,25 @@ DEFAULTS = {
     # password.
     "DEFAULT_BACKEND_CLASS": "rest_multi_factor.backends.DefaultBackend",
 
+    # The number of seconds the CachedBackend keeps the verification state
+    # of a token. The state is invalidated when a challenge or token changes.
+    "VERIFICATION_CACHE_TIMEOUT": 300,
+
     # The encryption settings points to the encryption handler for storing
     # sensitive values that need te be decrypted again.
     "DEFAULT_ENCRYPTION_CLASS":
         "rest_multi_factor.encryption.aes.AESEncryption",
 
+    # The secrets to derive the keys from for the rotating encryption class,
+    # the newest first. When empty the django SECRET_KEY is used.
+    "ENCRYPTION_KEYS": (),
+
+    # The number of decrypted secrets of lazy encrypted fields to keep in
+    # memory per process and for how many seconds. A size of zero disables
+    # this cache, it's advised to keep the timeout short.
+    "ENCRYPTION_CACHE_SIZE": 0,
+    "ENCRYPTION_CACHE_TIMEOUT": 10,
+
     # The throttle class for the verify() view. It is crucial that if this
     # setting is changed that it is taught through because these throttles are
     # the only thing that protects the verification against brute force attacks
@@ -37,11 +51,26 @@ DEFAULTS = {
     # development.
     "ALGORITHM_RFC_VALIDATION": True,
 
+    # Constant time verification evaluates the whole window of a one time
+    # password and compares every candidate with hmac.compare_digest, so the
+    # response time doesn't reveal which offset matched.
+    "ALGORITHM_CONSTANT_TIME": True,
+
     # Throttle tryouts and timeout are value's that tell how many times a token
     # or secret may be tried to be verified and the time to wait. A minimal of
     # 30 seconds is advised against brute forcing TOTP token
     "VERIFICATION_THROTTLE_TRYOUTS": 5,
     "VERIFICATION_THROTTLE_TIMEOUT": "30s",
+
+    # The identities the delaying throttles count the tryouts of, any of
+    # "token", "user", "ip" and "device". Throttling on the user prevents
+    # a fresh budget for every token that is created for the same account.
+    "VERIFICATION_THROTTLE_SCOPES": ("token",),
+
+    # The number of blocked tokens the delaying throttles remember per
+    # process, so rejections are answered without the shared cache while
+    # the wait period hasn't elapsed. A size of zero disables this.
+    "VERIFICATION_THROTTLE_LOCAL_CACHE_SIZE": 0,
 }
 
 LOADABLE = [
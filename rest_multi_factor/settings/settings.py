@@ -42,6 +42,8 @@ class MultiFactorSettings(APISettings):
         APISettings.__init__(self, user_settings, defaults, import_strings)
 
         self.namespace = namespace or "CUSTOM"
+        self.listeners = []
+
         setting_changed.connect(self.reload_settings)
 
     @property
@@ -69,6 +71,27 @@ class MultiFactorSettings(APISettings):
         if setting == self.namespace:
             self.reload()
 
+        for callback, names in self.listeners:
+            if setting in names:
+                callback()
+
+    def listen(self, callback, *names):
+        """
+        Register a callback for when a setting has been changed.
+
+        This can be used to invalidate values that are derived from
+        the settings. Without names the callback will only be called
+        when the settings within the namespace are changed.
+
+        :param callback: The callback to call without any arguments
+        :type callback: callable
+
+        :param names: The names of the (django) settings to listen to
+        :type names: str
+        """
+        names = frozenset(names or (self.namespace,))
+        self.listeners.append((callback, names))
+
     def register(self, defaults, import_strings=None):
         """
         Register a additional set of configurations that are available.
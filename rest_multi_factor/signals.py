@@ -0,0 +1,123 @@
+"""Signal receivers that keep the verification state up to date."""
+
+__all__ = (
+    "connect_signals",
+)
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+
+from rest_multi_factor.utils import get_token_model, get_subclassed_models
+from rest_multi_factor.models import Challenge
+from rest_multi_factor.settings import multi_factor_settings
+
+
+def get_backend():
+    """
+    Instantiate the configured backend.
+
+    :return: The backend to notify
+    :rtype: rest_multi_factor.backends.AbstractVerificationBackend
+    """
+    return multi_factor_settings.DEFAULT_BACKEND_CLASS()
+
+
+def get_token(challenge):
+    """
+    Retrieve the token of a challenge without querying it.
+
+    :param challenge: The challenge to get the token of
+    :type challenge: rest_multi_factor.models.Challenge
+
+    :return: A token instance with only the primary key set
+    :rtype: rest_framework.authtoken.Token | knox.model.AuthToken
+    """
+    return get_token_model()(pk=challenge.token_id)
+
+
+def invalidate(backend, token, using):
+    """
+    Invalidate the verification state of a token once committed.
+
+    Invalidating within the transaction would allow concurrent checks
+    to store the old state again before the change is visible to them.
+
+    :param backend: The backend to invalidate the state of
+    :type backend: rest_multi_factor.backends.AbstractVerificationBackend
+
+    :param token: The token of which the state changed
+    :type token: rest_framework.authtoken.Token | knox.model.AuthToken
+
+    :param using: The alias of the database that was changed
+    :type using: str
+    """
+    transaction.on_commit(lambda: backend.invalidate(token), using=using)
+
+
+def challenge_saved(instance, **_):
+    """
+    Receiver for saved challenges.
+
+    :param instance: The challenge that was saved
+    :type instance: rest_multi_factor.models.Challenge
+    """
+    stored = getattr(instance, "_stored_confirm", False)
+    instance._stored_confirm = instance.confirm
+
+    backend = get_backend()
+    invalidate(backend, get_token(instance), instance._state.db)
+
+    delta = int(bool(instance.confirm)) - int(bool(stored))
+    if delta:
+        backend.update_confirmed(get_token(instance), delta)
+
+
+def challenge_deleted(instance, **_):
+    """
+    Receiver for deleted challenges.
+
+    :param instance: The challenge that was deleted
+    :type instance: rest_multi_factor.models.Challenge
+    """
+    backend = get_backend()
+    invalidate(backend, get_token(instance), instance._state.db)
+
+    if getattr(instance, "_stored_confirm", instance.confirm):
+        backend.update_confirmed(get_token(instance), -1)
+
+
+def token_saved(instance, created, **_):
+    """
+    Receiver for saved tokens.
+
+    :param instance: The token that was saved
+    :type instance: rest_framework.authtoken.Token | knox.model.AuthToken
+
+    :param created: Whether the token was created
+    :type created: bool
+    """
+    if created:
+        get_backend().update_confirmed(instance, 0)
+
+
+def token_deleted(instance, **_):
+    """
+    Receiver for deleted tokens.
+
+    :param instance: The token that was deleted
+    :type instance: rest_framework.authtoken.Token | knox.model.AuthToken
+    """
+    # the primary key of the instance is cleared after the deletion
+    token = get_token_model()(pk=instance.pk)
+    invalidate(get_backend(), token, instance._state.db)
+
+
+def connect_signals():
+    """Connect the receivers to all challenges and the token model."""
+    for model in get_subclassed_models(Challenge):
+        post_save.connect(challenge_saved, sender=model)
+        post_delete.connect(challenge_deleted, sender=model)
+
+    post_save.connect(token_saved, sender=get_token_model())
+    post_delete.connect(token_deleted, sender=get_token_model())
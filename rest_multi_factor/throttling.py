@@ -1,7 +1,7 @@
 """
 Custom defined throttle classes.
 
-Here are two throttling classes defined that should provide protection
+Here are three throttling classes defined that should provide protection
 against brute-force attacks. This is critical because truncated OTPs
 like TOTP tokens are easy to brute force.
 """
@@ -10,13 +10,22 @@ __all__ = (
     "SimpleDelayingThrottle",
     "AbstractDelayingThrottle",
     "RecursiveDelayingThrottle",
+    "FixedWindowDelayingThrottle",
+    "ThrottleConfig",
+    "ThrottleCoordinator",
+    "get_throttle_config",
+    "get_local_throttle_cache",
 )
 
 import re
 import abc
 import time
+import struct
 import urllib.parse
 
+from collections import namedtuple
+from functools import lru_cache
+
 
 from django.core.cache import cache as default_cache
 from django.core.exceptions import ImproperlyConfigured
@@ -24,9 +33,99 @@ from django.core.exceptions import ImproperlyConfigured
 from rest_framework.throttling import BaseThrottle
 
 
+from rest_multi_factor.cache import LocalCache
 from rest_multi_factor.settings import multi_factor_settings
 
 
+# the number of attempts and the time of the last attempt
+HISTORY_FORMAT = struct.Struct("!Id")
+
+TIMEOUT_PATTERN = re.compile(r"^(\d+)([smhd])$", flags=re.IGNORECASE)
+TIMEOUT_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+THROTTLE_SCOPES = ("token", "user", "ip", "device")
+
+ThrottleConfig = namedtuple("ThrottleConfig", (
+    "tryouts",
+    "timeout",
+    "scopes",
+))
+
+
+def parse_timeout(value):
+    """
+    Parse a timeout specification.
+
+    This is a string that begins with a value and ends
+    with a timespan.
+
+    The timespan must be either s (seconds), m (minutes),
+    h (hours), d (days). the value must be a positive decimal.
+
+    :param value: The timeout specification
+    :type value: str
+
+    :return: The timeout in seconds.
+    :rtype: int
+    """
+    match = TIMEOUT_PATTERN.match(value)
+
+    if match is not None:
+        return int(match.group(1)) * TIMEOUT_UNITS[match.group(2).lower()]
+
+    raise ImproperlyConfigured(
+        "The value of 'VERIFICATION_THROTTLE_TIMEOUT'"
+        " must be in the format <value>[smhd] like for example ''30s'"
+    )
+
+
+@lru_cache(maxsize=1)
+def get_throttle_config():
+    """
+    Retrieve the configuration of the delaying throttles.
+
+    The settings are parsed once and shared by all throttle
+    instances until the settings are reloaded.
+
+    :return: The parsed configuration
+    :rtype: ThrottleConfig
+    """
+    scopes = tuple(multi_factor_settings.VERIFICATION_THROTTLE_SCOPES)
+
+    if not scopes or not set(scopes).issubset(THROTTLE_SCOPES):
+        raise ImproperlyConfigured(
+            "The value of 'VERIFICATION_THROTTLE_SCOPES' must be a non-empty"
+            " sequence of {0}".format(", ".join(THROTTLE_SCOPES))
+        )
+
+    return ThrottleConfig(
+        multi_factor_settings.VERIFICATION_THROTTLE_TRYOUTS,
+        parse_timeout(multi_factor_settings.VERIFICATION_THROTTLE_TIMEOUT),
+        scopes,
+    )
+
+
+@lru_cache(maxsize=1)
+def get_local_throttle_cache():
+    """
+    Retrieve the per process cache of blocked tokens.
+
+    :return: The cache to use or None if it's disabled
+    :rtype: rest_multi_factor.cache.LocalCache | None
+    """
+    size = multi_factor_settings.VERIFICATION_THROTTLE_LOCAL_CACHE_SIZE
+
+    if not size:
+        return None
+
+    return LocalCache(size)
+
+
+multi_factor_settings.listen(get_throttle_config.cache_clear)
+multi_factor_settings.listen(get_local_throttle_cache.cache_clear)
+
+
 class AbstractDelayingThrottle(BaseThrottle, metaclass=abc.ABCMeta):
     """Mixin class for brute-force protecting throttles."""
 
@@ -79,37 +178,24 @@ class AbstractDelayingThrottle(BaseThrottle, metaclass=abc.ABCMeta):
 
     def parse_timeout(self, value):
         """
-        Parse a timeout specification.
-
-        This is a string that begins with a value and ends
-        with a timespan.
+        Parse a timeout specification using the module-level helper.
 
-        The timespan must be either s (seconds), m (minutes),
-        h (hours), d (days). the value must be a positive decimal.
+        :param value: The timeout specification
+        :type value: str
 
         :return: The timeout in seconds.
         :rtype: int
         """
-        if hasattr(self, "_parsed_timeout"):
-            return getattr(self, "_parsed_timeout")
-
-        pattern = re.compile(r"^(\d+)([smhd])$", flags=re.IGNORECASE)
-        match = pattern.match(value)
-
-        if match is not None:
-            index = match.group(2).lower()
-            value = int(match.group(1)) * {
-                "s": 1, "m": 60, "h": 3600, "d": 86400
-            }[index]
+        return parse_timeout(value)
 
-            setattr(self, "_parsed_timeout", value)
-
-            return value
+    def get_config(self):
+        """
+        Retrieve the shared configuration of the throttle.
 
-        raise ImproperlyConfigured(
-            "The value of 'VERIFICATION_THROTTLE_TIMEOUT'"
-            " must be in the format <value>[smhd] like for example ''30s'"
-        )
+        :return: The parsed configuration
+        :rtype: ThrottleConfig
+        """
+        return get_throttle_config()
 
     def get_tryouts(self):
         """
@@ -118,7 +204,7 @@ class AbstractDelayingThrottle(BaseThrottle, metaclass=abc.ABCMeta):
         :return: The number of tryouts
         :rtype: int
         """
-        return multi_factor_settings.VERIFICATION_THROTTLE_TRYOUTS
+        return self.get_config().tryouts
 
     def get_timeout(self):
         """
@@ -127,9 +213,92 @@ class AbstractDelayingThrottle(BaseThrottle, metaclass=abc.ABCMeta):
         :return: The timout in seconds
         :rtype: int
         """
-        return self.parse_timeout(
-            multi_factor_settings.VERIFICATION_THROTTLE_TIMEOUT
-        )
+        return self.get_config().timeout
+
+    def get_scopes(self):
+        """
+        Retrieve the identity scopes to throttle on.
+
+        :return: The names of the scopes
+        :rtype: tuple of str
+        """
+        return self.get_config().scopes
+
+    def get_local_history(self, identifier):
+        """
+        Retrieve the history of a blocked token from the local cache.
+
+        :param identifier: The unique cache key of the token
+        :type identifier: str
+
+        :return: The number of attempts and the time of the last attempt
+                 or None if the token isn't known to be blocked
+        :rtype: tuple | None
+        """
+        local_cache = get_local_throttle_cache()
+
+        if local_cache is None:
+            return None
+
+        return local_cache.get((self.scope, identifier))
+
+    def set_local_history(self, identifier, history, timeout):
+        """
+        Remember the history of a blocked token in the local cache.
+
+        :param identifier: The unique cache key of the token
+        :type identifier: str
+
+        :param history: The number of attempts and the time of the last
+                        attempt
+        :type history: tuple
+
+        :param timeout: The number of seconds the token is blocked
+        :type timeout: float
+        """
+        local_cache = get_local_throttle_cache()
+
+        if local_cache is not None:
+            local_cache.set((self.scope, identifier), history, timeout)
+
+    def encode_history(self, count, last):
+        """
+        Encode a history of attempts for the cache.
+
+        Only the number of attempts and the time of the last attempt
+        are stored, packed into a fixed size of 12 bytes.
+
+        :param count: The number of attempts
+        :type count: int
+
+        :param last: The time of the last attempt
+        :type last: float
+
+        :return: The encoded history
+        :rtype: bytes
+        """
+        return HISTORY_FORMAT.pack(count, last)
+
+    def decode_history(self, value):
+        """
+        Decode a history of attempts from the cache.
+
+        Histories that are stored as a tuple of timestamps by
+        previous versions are decoded as well.
+
+        :param value: The cached value
+        :type value: bytes | tuple | None
+
+        :return: The number of attempts and the time of the last attempt
+        :rtype: tuple
+        """
+        if value is None:
+            return 0, 0.0
+
+        if isinstance(value, tuple):
+            return len(value), value[-1] if value else 0.0
+
+        return HISTORY_FORMAT.unpack(value)
 
     @classmethod
     def get_ident(cls, request):
@@ -154,6 +323,190 @@ class AbstractDelayingThrottle(BaseThrottle, metaclass=abc.ABCMeta):
 
         return urllib.parse.quote("{0} {1}".format(cls.scope, request.auth))
 
+    def get_idents(self, request, scopes=None):
+        """
+        Get the unique cache keys for every configured identity scope.
+
+        The token scope uses the key of `get_ident()`, the other scopes
+        are the user, the client IP address and the device of the user
+        that is being verified. The device scope is skipped for requests
+        without a device index, when no other scope applies the token
+        scope is used so every request is throttled.
+
+        :param request: The current request instance
+        :type request: rest_framework.request.Request
+
+        :param scopes: The scopes to use, defaults to the configured scopes
+        :type scopes: tuple of str
+
+        :return: The unique cache keys
+        :rtype: list of str
+        """
+        identifiers = []
+
+        for scope in scopes or self.get_scopes():
+            if scope == "token":
+                identifiers.append(self.get_ident(request))
+                continue
+
+            if scope == "user":
+                value = request.user.pk
+
+            elif scope == "ip":
+                value = BaseThrottle.get_ident(self, request)
+
+            else:
+                context = getattr(request, "parser_context", None) or {}
+                index = context.get("kwargs", {}).get("index")
+
+                if index is None:
+                    continue
+
+                value = "{0}:{1}".format(request.user.pk, index)
+
+            identifiers.append(urllib.parse.quote(
+                "{0} {1} {2}".format(self.scope, scope, value)
+            ))
+
+        if not identifiers:
+            identifiers.append(self.get_ident(request))
+
+        return identifiers
+
+    def prepare(self, request):
+        """
+        Prepare the throttle for a request.
+
+        Throttles that store a history per identity override this to
+        resolve their configuration and return the cache keys, which
+        allows the ThrottleCoordinator to batch them with other throttles.
+
+        :param request: The current request instance
+        :type request: rest_framework.request.Request
+
+        :return: The unique cache keys or None if this can't be batched
+        :rtype: list of str | None
+        """
+        return None
+
+    def is_blocked_locally(self, identifiers):
+        """
+        Tell whether any identity is known to be blocked in this process.
+
+        :param identifiers: The unique cache keys of the identities
+        :type identifiers: list of str
+
+        :return: Whether the request should be rejected
+        :rtype: bool
+        """
+        for identifier in identifiers:
+            history = self.get_local_history(identifier)
+
+            if history is not None and self.get_wait(history) > 0:
+                self.history = history
+                return True
+
+        return False
+
+    def evaluate_histories(self, identifiers, cached):
+        """
+        Check and record an attempt for every identity.
+
+        When any identity is blocked the request is rejected and
+        `history` is set to the history with the longest wait. The
+        expiry of a history follows from the time of the last attempt,
+        so histories can be stored with any timeout. This requires the
+        `get_wait()` and `get_next_count()` methods and the
+        `cache_timeout` attribute that is set by `prepare()`.
+
+        :param identifiers: The unique cache keys of the identities
+        :type identifiers: list of str
+
+        :param cached: The cached values, as returned by `get_many`
+        :type cached: dict
+
+        :return: The encoded histories to store or None if rejected
+        :rtype: dict | None
+        """
+        now = self.timer()
+        histories = {}
+
+        for identifier in identifiers:
+            history = self.decode_history(cached.get(identifier))
+
+            if history[1] + self.cache_timeout <= now:
+                history = (0, 0.0)
+
+            histories[identifier] = history
+
+        waits = {i: self.get_wait(h) for i, h in histories.items()}
+
+        blocked = max(identifiers, key=waits.__getitem__)
+        self.history = histories[blocked]
+
+        if waits[blocked] > 0:
+            self.set_local_history(blocked, self.history, waits[blocked])
+            return None
+
+        return {
+            i: self.encode_history(self.get_next_count(h), now)
+            for i, h in histories.items()
+        }
+
+    def check_histories(self, identifiers):
+        """
+        Check and record an attempt for every identity at once.
+
+        The histories are read with one `get_many` and written with
+        one `set_many`.
+
+        :param identifiers: The unique cache keys of the identities
+        :type identifiers: list of str
+
+        :return: Whether the request should be allowed or not
+        :rtype: bool
+        """
+        if self.is_blocked_locally(identifiers):
+            return False
+
+        cached = self.cache.get_many(identifiers)
+        histories = self.evaluate_histories(identifiers, cached)
+
+        if histories is None:
+            return False
+
+        self.cache.set_many(histories, self.cache_timeout)
+        return True
+
+    def get_clear_idents(self, request):
+        """
+        Get the cache keys to remove when a token is verified.
+
+        Every configured scope is cleared except the IP address, so a
+        successful verification can't reset the budget of an address.
+
+        :param request: The current request instance
+        :type request: rest_framework.request.Request
+
+        :return: The unique cache keys
+        :rtype: list of str
+        """
+        scopes = tuple(s for s in self.get_scopes() if s != "ip")
+        return self.get_idents(request, scopes) if scopes else []
+
+    def forget_local(self, identifiers):
+        """
+        Remove identities from the local cache of blocked tokens.
+
+        :param identifiers: The unique cache keys of the identities
+        :type identifiers: list of str
+        """
+        local_cache = get_local_throttle_cache()
+
+        if local_cache is not None:
+            for identifier in identifiers:
+                local_cache.delete((self.scope, identifier))
+
     @classmethod
     def clear(cls, request):
         """
@@ -163,7 +516,111 @@ class AbstractDelayingThrottle(BaseThrottle, metaclass=abc.ABCMeta):
         :type request: rest_-framework.request.Request
         """
         instance = cls()
-        instance.cache.delete(instance.get_ident(request))
+        identifiers = instance.get_clear_idents(request)
+
+        if identifiers:
+            instance.cache.delete_many(identifiers)
+            instance.forget_local(identifiers)
+
+
+class ThrottleCoordinator(object):
+    """
+    Evaluate several throttles with batched cache operations.
+
+    The histories of all throttles that support batching are read with
+    one `get_many` and written with one `set_many` per cache backend,
+    so stacking throttles doesn't multiply the cache latency. Other
+    throttles are evaluated the regular way.
+    """
+
+    def __init__(self, throttles):
+        """
+        Initialize the coordinator.
+
+        :param throttles: The throttle instances to coordinate
+        :type throttles: list of rest_framework.throttling.BaseThrottle
+        """
+        self.throttles = throttles
+
+    def check(self, request, view):
+        """
+        Check every throttle for the request.
+
+        Just like django REST framework every throttle records the attempt
+        when it allows the request, even if another throttle rejects it.
+
+        :param request: The current request instance
+        :type request: rest_framework.request.Request
+
+        :param view: The view that is currently being accessed
+        :type view: rest_framework.views.APIView
+
+        :return: The throttles that rejected the request
+        :rtype: list of rest_framework.throttling.BaseThrottle
+        """
+        rejected = []
+        batches = {}
+
+        for throttle in self.throttles:
+            prepare = getattr(throttle, "prepare", None)
+            identifiers = prepare(request) if prepare else None
+
+            if identifiers is None:
+                if not throttle.allow_request(request, view):
+                    rejected.append(throttle)
+
+            elif throttle.is_blocked_locally(identifiers):
+                rejected.append(throttle)
+
+            else:
+                batch = batches.setdefault(id(throttle.cache), [])
+                batch.append((throttle, identifiers))
+
+        for batch in batches.values():
+            cache = batch[0][0].cache
+            keys = [key for _, identifiers in batch for key in identifiers]
+
+            cached = cache.get_many(keys)
+            histories = {}
+            timeout = 0
+
+            for throttle, identifiers in batch:
+                updates = throttle.evaluate_histories(identifiers, cached)
+
+                if updates is None:
+                    rejected.append(throttle)
+                    continue
+
+                histories.update(updates)
+                timeout = max(timeout, throttle.cache_timeout)
+
+            if histories:
+                cache.set_many(histories, timeout)
+
+        return rejected
+
+    def clear(self, request):
+        """
+        Clear the caches of all delaying throttles for a token at once.
+
+        :param request: The current request instance
+        :type request: rest_framework.request.Request
+        """
+        batches = {}
+
+        for throttle in self.throttles:
+            if isinstance(throttle, AbstractDelayingThrottle):
+                identifiers = throttle.get_clear_idents(request)
+                throttle.forget_local(identifiers)
+
+                batch = batches.setdefault(id(throttle.cache), [])
+                batch.append((throttle.cache, identifiers))
+
+        for batch in batches.values():
+            keys = [key for _, identifiers in batch for key in identifiers]
+
+            if keys:
+                batch[0][0].delete_many(keys)
 
 
 class SimpleDelayingThrottle(AbstractDelayingThrottle):
@@ -181,6 +638,7 @@ class SimpleDelayingThrottle(AbstractDelayingThrottle):
     history = None
     timeout = None
     tryouts = None
+    cache_timeout = None
 
     def allow_request(self, request, view):
         """
@@ -195,23 +653,23 @@ class SimpleDelayingThrottle(AbstractDelayingThrottle):
         :return: Whether the request should be further processed or not
         :rtype: bool
         """
-        identifier = self.get_ident(request)
-        expiration = self.get_cache_timeout()
-
-        self.tryouts = self.get_tryouts()
-        self.timeout = self.get_timeout()
+        return self.check_histories(self.prepare(request))
 
-        self.history = self.cache.get_or_set(identifier, (), expiration)
+    def prepare(self, request):
+        """
+        Prepare the throttle for a request.
 
-        wait_period = self.wait()
-        if wait_period is not None and wait_period > 0:
-            return False
+        :param request: The current request instance
+        :type request: rest_framework.request.Request
 
-        if wait_period is not None and wait_period <= 0:
-            self.history = ()
+        :return: The unique cache keys
+        :rtype: list of str
+        """
+        self.tryouts = self.get_tryouts()
+        self.timeout = self.get_timeout()
+        self.cache_timeout = self.get_cache_timeout()
 
-        self.cache.set(identifier, (*self.history, self.timer()), expiration)
-        return True
+        return self.get_idents(request)
 
     def wait(self):
         """
@@ -220,10 +678,42 @@ class SimpleDelayingThrottle(AbstractDelayingThrottle):
         :return: The number of seconds to wait
         :rtype: None | int
         """
-        if len(self.history) < self.tryouts:
+        if self.history[0] < self.tryouts:
             return None
 
-        return (self.history[-1] + self.timeout) - self.timer()
+        return self.get_wait(self.history)
+
+    def get_wait(self, history):
+        """
+        Calculate the number of seconds a history has to wait.
+
+        :param history: The number of attempts and the last attempt
+        :type history: tuple
+
+        :return: The number of seconds to wait, zero or less if allowed
+        :rtype: float
+        """
+        count, last = history
+
+        if count < self.tryouts:
+            return 0
+
+        return (last + self.timeout) - self.timer()
+
+    def get_next_count(self, history):
+        """
+        Calculate the number of attempts after an allowed attempt.
+
+        The count starts over once the timeout after the maximum
+        number of attempts has passed.
+
+        :param history: The number of attempts and the last attempt
+        :type history: tuple
+
+        :return: The new number of attempts
+        :rtype: int
+        """
+        return history[0] + 1 if history[0] < self.tryouts else 1
 
     def get_cache_timeout(self):
         """
@@ -253,8 +743,10 @@ class RecursiveDelayingThrottle(AbstractDelayingThrottle):
     cache = default_cache
     timer = time.time
 
-    tryouts = None
+    history = None
     timeout = None
+    tryouts = None
+    cache_timeout = None
 
     def allow_request(self, request, view):
         """
@@ -272,21 +764,23 @@ class RecursiveDelayingThrottle(AbstractDelayingThrottle):
         :return: Whether the request should be further processed or not
         :rtype: bool
         """
-        identifier = self.get_ident(request)
+        return self.check_histories(self.prepare(request))
 
-        cache_timeout = self.get_cache_timeout(
-            self.get_tryouts(), self.get_timeout()
-        )
+    def prepare(self, request):
+        """
+        Prepare the throttle for a request.
 
-        self.timeout = self.get_timeout()
-        self.tryouts = self.cache.get_or_set(identifier, (), cache_timeout)
+        :param request: The current request instance
+        :type request: rest_framework.request.Request
 
-        if self.wait() > 0:
-            return False
+        :return: The unique cache keys
+        :rtype: list of str
+        """
+        self.tryouts = self.get_tryouts()
+        self.timeout = self.get_timeout()
+        self.cache_timeout = self.get_cache_timeout(self.tryouts, self.timeout)
 
-        truncated = (*self.tryouts, self.timer())[-self.get_tryouts():]
-        self.cache.set(identifier, truncated, cache_timeout)
-        return True
+        return self.get_idents(request)
 
     def wait(self):
         """
@@ -295,11 +789,36 @@ class RecursiveDelayingThrottle(AbstractDelayingThrottle):
         :return: The number of seconds to wait
         :rtype: int
         """
-        if not bool(len(self.tryouts)):
+        return self.get_wait(self.history)
+
+    def get_wait(self, history):
+        """
+        Calculate the number of seconds a history has to wait.
+
+        :param history: The number of attempts and the last attempt
+        :type history: tuple
+
+        :return: The number of seconds to wait, zero or less if allowed
+        :rtype: float
+        """
+        count, last = history
+
+        if not count:
             return 0
 
-        timeout = (self.tryouts[-1] + (len(self.tryouts) * self.timeout))
-        return timeout - self.timer()
+        return (last + (count * self.timeout)) - self.timer()
+
+    def get_next_count(self, history):
+        """
+        Calculate the number of attempts after an allowed attempt.
+
+        :param history: The number of attempts and the last attempt
+        :type history: tuple
+
+        :return: The new number of attempts, at most the tryouts
+        :rtype: int
+        """
+        return min(history[0] + 1, self.tryouts)
 
     def get_cache_timeout(self, n, t):
         """
@@ -327,3 +846,111 @@ class RecursiveDelayingThrottle(AbstractDelayingThrottle):
         :rtype: int
         """
         return sum(t*(i+1) for i in range(0, n))
+
+
+class FixedWindowDelayingThrottle(AbstractDelayingThrottle):
+    """
+    Fixed Window Delaying Throttle.
+
+    Allows a maximum number of requests per window of the timeout
+    setting for every identity scope. The requests are counted with
+    the atomic `cache.add` and `cache.incr` operations, which takes a
+    single round trip per scope in most cases and can't be raced on
+    backends like memcached or redis.
+    """
+
+    scope = "window"
+    timer = time.time
+    cache = default_cache
+
+    count = None
+    window = None
+    timeout = None
+
+    def allow_request(self, request, view):
+        """
+        Check whether or not to allow a request to verify.
+
+        Every identity records the request, the request is rejected
+        when any identity exceeded the maximum.
+
+        :param request: The current request instance.
+        :type request: rest_framework.request.Request
+
+        :param view: The view that is currently being accessed
+        :type view: rest_framework.views.APIView
+
+        :return: Whether the request should be further processed or not
+        :rtype: bool
+        """
+        self.timeout = self.get_timeout()
+        self.window = int(self.timer() // self.timeout)
+
+        self.count = max(
+            self.increment(self.get_window_ident(identifier, self.window))
+            for identifier in self.get_idents(request)
+        )
+
+        return self.count <= self.get_tryouts()
+
+    def increment(self, identifier):
+        """
+        Count a request for the counter of a window.
+
+        :param identifier: The unique cache key of the counter
+        :type identifier: str
+
+        :return: The number of requests in the window
+        :rtype: int
+        """
+        try:
+            return self.cache.incr(identifier)
+
+        except ValueError:
+            # the key didn't exist yet, unless another request was first
+            if self.cache.add(identifier, 1, self.timeout):
+                return 1
+
+            return self.cache.incr(identifier)
+
+    def wait(self):
+        """
+        Calculate the number of seconds until the next window.
+
+        :return: The number of seconds to wait
+        :rtype: float
+        """
+        return (self.window + 1) * self.timeout - self.timer()
+
+    @staticmethod
+    def get_window_ident(identifier, window):
+        """
+        Get the unique cache key for an identity and window.
+
+        :param identifier: The unique cache key of the identity
+        :type identifier: str
+
+        :param window: The index of the window
+        :type window: int
+
+        :return: The unique cache key
+        :rtype: str
+        """
+        return "{0}%20{1}".format(identifier, window)
+
+    def get_clear_idents(self, request):
+        """
+        Get the cache keys of the counters of the current window.
+
+        :param request: The current request instance
+        :type request: rest_framework.request.Request
+
+        :return: The unique cache keys
+        :rtype: list of str
+        """
+        window = int(self.timer() // self.get_timeout())
+
+        return [
+            self.get_window_ident(identifier, window)
+            for identifier in super().get_clear_idents(request)
+        ]
@@ -1,22 +1,269 @@
 """Utilities for multi-factor authentication."""
 
 __all__ = (
+    "Parameter",
+    "QueryCounter",
+    "PreparedQuery",
     "unify_queryset",
+    "filter_subclassed_models",
     "get_user_model",
     "get_token_model",
     "get_subclassed_models",
 )
 
+from contextlib import ExitStack, contextmanager
+
+
 from django import VERSION
+from django.db import connections, router
 from django.apps import apps
 from django.contrib.auth import get_user_model
+from django.db.models import IntegerField, Value
+from django.db.models.expressions import RawSQL
 from django.db.models.query import EmptyQuerySet, Q
+from django.db.models.sql.where import WhereNode
 from django.core.exceptions import ImproperlyConfigured
 
 
 from rest_multi_factor.settings import multi_factor_settings
 
 
+# base model -> (the list of models it was found in, the subclasses)
+_subclassed_models = {}
+
+
+class QueryCounter(object):
+    """
+    Context manager that counts the executed database queries.
+
+    Queries are counted on every database connection, for example::
+
+        with QueryCounter() as counter:
+            ...
+
+        print(counter.count)
+
+    Django versions without `execute_wrapper` (before 2.0) count
+    the queries through the query log of the connections instead.
+    """
+
+    def __init__(self):
+        """Initialize the counter."""
+        self.count = 0
+        self.stack = None
+
+    def __enter__(self):
+        """Start counting the queries."""
+        self.stack = ExitStack()
+
+        for connection in connections.all():
+            if VERSION < (2, 0, 0):
+                self.stack.enter_context(self.log_queries(connection))
+
+            else:
+                self.stack.enter_context(connection.execute_wrapper(self))
+
+        return self
+
+    def __exit__(self, *exc_info):
+        """Stop counting the queries."""
+        self.stack.close()
+
+    @contextmanager
+    def log_queries(self, connection):
+        """
+        Count the queries of a connection through its query log.
+
+        :param connection: The connection to count the queries of
+        :type connection: django.db.backends.base.base.BaseDatabaseWrapper
+        """
+        debug_cursor = connection.force_debug_cursor
+        connection.force_debug_cursor = True
+
+        start = len(connection.queries_log)
+
+        try:
+            yield
+
+        finally:
+            self.count += len(connection.queries_log) - start
+            connection.force_debug_cursor = debug_cursor
+
+    def __call__(self, execute, sql, params, many, context):
+        """Count and execute a query, see `execute_wrapper`."""
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+class Parameter(object):
+    """Placeholder for a value that is bound when a query is executed."""
+
+    __slots__ = ("name", "field")
+
+    def __init__(self, name):
+        """
+        Initialize the placeholder.
+
+        :param name: The name of the parameter
+        :type name: str
+        """
+        self.name = name
+        self.field = None
+
+    def prepare(self, value, connection):
+        """
+        Prepare a value for the database like the ORM would.
+
+        Model instances are bound by their primary key, which is
+        converted by the field that it's compared with (if known).
+
+        :param value: The value to prepare
+        :type value: any
+
+        :param connection: The connection to prepare the value for
+        :type connection: django.db.backends.base.base.BaseDatabaseWrapper
+
+        :return: The prepared value
+        :rtype: any
+        """
+        value = getattr(value, "pk", value)
+
+        if self.field is None:
+            return value
+
+        return self.field.get_db_prep_value(value, connection)
+
+
+class PreparedQuery(object):
+    """
+    Query that is compiled once and executed with bound parameters.
+
+    The factory builds the queryset with an expression for every named
+    parameter, for example::
+
+        devices = PreparedQuery(
+            lambda user: unify_queryset(Device, ("id",), Q(user=user)),
+            "user",
+        )
+
+        rows = devices.execute(user=request.user)
+
+    The SQL is compiled once per database and again when the
+    app registry changes.
+    """
+
+    def __init__(self, factory, *names):
+        """
+        Initialize the query.
+
+        :param factory: Function that builds the queryset
+        :type factory: callable
+
+        :param names: The names of the parameters
+        :type names: str
+        """
+        self.factory = factory
+        self.names = names
+
+        self.models = None
+        self.queryset = None
+        self.compiled = {}
+
+    def get_queryset(self):
+        """
+        Retrieve the queryset with placeholders for the parameters.
+
+        :return: The queryset built by the factory
+        :rtype: django.db.models.query.QuerySet
+        """
+        models = apps.get_models()
+
+        if self.models is not models:
+            self.compiled = {}
+            self.queryset = self.factory(**{
+                name: RawSQL("%s", (Parameter(name),)) for name in self.names
+            })
+            self.models = models
+
+            self.resolve_fields(self.queryset.query)
+
+        return self.queryset
+
+    def resolve_fields(self, query):
+        """
+        Resolve the fields the parameters are compared with.
+
+        The where clauses of the query and the queries it's combined
+        with are searched for lookups against a parameter.
+
+        :param query: The query to search
+        :type query: django.db.models.sql.query.Query
+        """
+        nodes = [query.where]
+        nodes.extend(q.where for q in query.combined_queries)
+
+        while nodes:
+            node = nodes.pop()
+
+            if isinstance(node, WhereNode):
+                nodes.extend(node.children)
+                continue
+
+            source = getattr(node, "rhs", None)
+            output = getattr(getattr(node, "lhs", None), "output_field", None)
+
+            if isinstance(source, RawSQL) and output is not None:
+                for param in source.params:
+                    if isinstance(param, Parameter):
+                        param.field = output
+
+    def compile(self, using):
+        """
+        Compile the queryset for a database.
+
+        :param using: The alias of the database
+        :type using: str
+
+        :return: The SQL and the parameters, including placeholders
+        :rtype: tuple
+        """
+        compiled = self.compiled.get(using)
+
+        if compiled is None:
+            compiler = self.get_queryset().query.get_compiler(using=using)
+            compiled = self.compiled[using] = compiler.as_sql()
+
+        return compiled
+
+    def execute(self, **values):
+        """
+        Execute the query with the values of the parameters.
+
+        Values are prepared by the field they're compared with.
+
+        :param values: The value of every parameter
+        :type values: any
+
+        :return: The resulting rows
+        :rtype: list of tuple
+        """
+        queryset = self.get_queryset()
+        using = router.db_for_read(queryset.model)
+
+        sql, params = self.compile(using)
+        connection = connections[using]
+
+        params = [
+            p.prepare(values[p.name], connection)
+            if isinstance(p, Parameter) else p
+            for p in params
+        ]
+
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return cursor.fetchall()
+
+
 def get_token_model():
     """
     Helper function to retrieve the token model that should be used.
@@ -54,6 +301,10 @@ def get_subclassed_models(base):
     abstract base model that defines fields that need to
     be compared at all together.
 
+    The result is cached until the app registry changes, which
+    is detected by the identity of the cached list of models that
+    django returns until its own cache is cleared.
+
     :param base: The base model
     :type base: type of django.db.models.base.Model
 
@@ -61,8 +312,13 @@ def get_subclassed_models(base):
     :rtype: tuple
     """
     models = apps.get_models()
+    cached = _subclassed_models.get(base)
+
+    if cached is None or cached[0] is not models:
+        subclasses = tuple(m for m in models if issubclass(m, base))
+        cached = _subclassed_models[base] = (models, subclasses)
 
-    return tuple(m for m in models if issubclass(m, base))
+    return cached[1]
 
 
 def get_model_fields(model):
@@ -78,7 +334,54 @@ def get_model_fields(model):
     return tuple(field.name for field in meta.get_fields())
 
 
-def unify_queryset(base, fields=None, filter=None, queryset=None):
+def filter_subclassed_models(base, fields=None, filter=None, label=None,
+                             models=None, start=0):
+    """
+    Filter and select the same fields of every sub model of another model.
+
+    The resulting querysets can be combined with other querysets
+    in a single UNION query.
+
+    :param base: The base class to use
+    :type base: type of django.db.models.base.Model
+
+    :param fields: The fields to select within the query
+    :type fields: tuple of str
+
+    :param filter: The filter to use for every queryset
+    :type filter: django.db.models.query.Q
+
+    :param label: The name to select the index of the sub model of every
+                  row as, indexes follow the order of the models
+    :type label: str | None
+
+    :param models: The sub models to filter, defaults to all subclasses
+    :type models: tuple of type of django.db.models.base.Model
+
+    :param start: The index of the first model
+    :type start: int
+
+    :return: A values queryset per sub model
+    :rtype: list of django.db.models.query.QuerySet
+    """
+    filter = filter or Q()
+    fields = get_model_fields(base) if fields is None else tuple(fields)
+    models = models or get_subclassed_models(base)
+
+    filtered = (m.objects.order_by().filter(filter) for m in models)
+
+    if label is not None:
+        filtered = (
+            q.annotate(**{label: Value(i, output_field=IntegerField())})
+            for i, q in enumerate(filtered, start)
+        )
+        fields += (label,)
+
+    return [q.values(*fields) for q in filtered]
+
+
+def unify_queryset(base, fields=None, filter=None, queryset=None,
+                   label=None, models=None):
     """
     Unify sub models of another model.
 
@@ -98,20 +401,23 @@ def unify_queryset(base, fields=None, filter=None, queryset=None):
     :param queryset: The base queryset to use
     :type queryset:
 
+    :param label: The name to select the index of the sub model of every
+                  row as, indexes follow the order of the models
+    :type label: str | None
+
+    :param models: The sub models to unify, defaults to all subclasses
+    :type models: tuple of type of django.db.models.base.Model
+
     :return: A new queryset that unified all subclassed models of base
     :rtype: django.db.models.
     """
-    filter = filter or Q()
-    fields = fields or get_model_fields(base)
-    models = get_subclassed_models(base)
+    models = models or get_subclassed_models(base)
+    filtered = filter_subclassed_models(base, fields, filter, label, models)
 
     queryset = queryset or models[0].objects.none()
-    filtered = (m.objects.order_by() for m in models)
-    filtered = (q.filter(filter).values(*fields) for q in filtered)
 
     # ticket: https://code.djangoproject.com/ticket/28293
     if VERSION < (2, 0, 0) and isinstance(queryset, EmptyQuerySet):
-        filtered = list(filtered)  # pragma: no cover
         queryset = filtered.pop(0)  # pragma: no cover
 
     return queryset.union(*filtered, all=True)
@@ -5,8 +5,12 @@ __all__ = (
     "MultiFactorRegistrationViewSet",
 )
 
+import functools
 import itertools
 
+from django.db import IntegrityError, router, transaction
+from django.db.models.expressions import OuterRef, Subquery
+
 from rest_framework import status
 from rest_framework.viewsets import ViewSet
 from rest_framework.response import Response
@@ -17,7 +21,7 @@ from rest_framework.decorators import throttle_classes
 from rest_multi_factor.mixins import DeviceMixin
 from rest_multi_factor.registry import registry
 from rest_multi_factor.settings import multi_factor_settings
-from rest_multi_factor.throttling import AbstractDelayingThrottle
+from rest_multi_factor.throttling import ThrottleCoordinator
 from rest_multi_factor.serializers import DeviceSerializer, ValueSerializer
 from rest_multi_factor.permissions import IsVerifiedOrNoDevice
 from rest_multi_factor.permissions import IsTokenAuthenticated
@@ -84,6 +88,18 @@ class MultiFactorVerifierViewSet(DeviceMixin, ViewSet):
         """
         Verify a token with the submitted value.
 
+        Besides the statements of the transaction, a verification takes
+        at most three queries, one for the device and its challenge, one
+        (depending on the backend) for the verifications left and one to
+        store the confirmation. Challenges that store state elsewhere, like
+        the counter of HOTP devices, take additional queries.
+
+        Verifying and storing the challenge happens in one transaction,
+        so state changed by the verification (like the HOTP counter) is
+        rolled back when storing fails. Concurrent first verifications of
+        the same challenge can't both insert it, the one that fails is
+        treated as unverified.
+
         :param request: The current request instance
         :type request: rest_framework.requests.Request
 
@@ -94,42 +110,41 @@ class MultiFactorVerifierViewSet(DeviceMixin, ViewSet):
         :rtype: rest_framework.response.Response
         """
         val = self.get_value(request)
-        dev = self.get_user_device(request.user, **kwargs)
+        dev = self.get_device(**kwargs)
 
-        instance = dev.objects.get(user=request.user)
-        queryset = dev.challenge.objects.filter(device=instance)
+        challenge = self.get_user_challenge(request, dev)
 
-        confirmed = False
+        save = functools.partial(self.save_challenge, challenge)
+        backend = self.get_backend()
 
-        # Dispatchable challenges usually generate the value
-        # just before dispatching. To make sure that this is
-        # still respected we won't create a new challenge for
-        # dispatchable challenges when they don't yet exist.
-        if dev.dispatchable:
-            challenge = get_object_or_404(
-                queryset, token=request.auth, confirm=False
-            )
-            confirmed = challenge.verify(val)
+        using = router.db_for_write(type(challenge))
 
-        elif not queryset.filter(token=request.auth, confirm=True).exists():
-            challenge = queryset.get_or_create(
-                device=instance, token=request.auth, confirm=False
-            )[0]
-            confirmed = challenge.verify(val)
+        try:
+            with transaction.atomic(using=using):
+                if challenge.confirm or not challenge.verify(val, False):
+                    return self.unverified()
 
-        if not confirmed:
-            headers = {
-                "WWW-Authenticate": "JSON realm=\"multi factor verification\""
-            }
-            return Response(status=401, headers=headers)
+                counted = backend.confirm(request.auth, self, save)
 
-        backend = self.get_backend()
-        counted = backend.verify(request.auth, self)
+        except IntegrityError:
+            return self.unverified()
 
         self.clear_cache(self.get_throttles(), request)
 
         return Response({"verifications-left": counted}, status=200)
 
+    def unverified(self):
+        """
+        Build the response for a failed verification.
+
+        :return: The response for a failed verification
+        :rtype: rest_framework.response.Response
+        """
+        headers = {
+            "WWW-Authenticate": "JSON realm=\"multi factor verification\""
+        }
+        return Response(status=401, headers=headers)
+
     def dispatch_challenge(self, request, **kwargs):
         """
         Dispatch a challenge for validating.
@@ -160,6 +175,75 @@ class MultiFactorVerifierViewSet(DeviceMixin, ViewSet):
         challenge.dispatch()
         return Response(status=204)
 
+    def get_user_challenge(self, request, device):
+        """
+        Retrieve the challenge of a device for the current token.
+
+        Dispatchable challenges usually generate the value just before
+        dispatching, so they MUST already exist and are fetched together
+        with their device. Other devices are fetched together with every
+        field of their challenge, which is instantiated (but not saved)
+        when it doesn't exist yet. Both only take a single query.
+
+        :param request: The current request instance
+        :type request: rest_framework.request.Request
+
+        :param device: The model class of the device
+        :type device: rest_multi_factor.models.meta.DeviceMeta
+
+        :return: The challenge of the device for the current token
+        :rtype: rest_multi_factor.models.Challenge
+
+        :raises rest_framework.exceptions.NotFound: When the user doesn't
+        own the device or a dispatchable challenge doesn't exist.
+        """
+        challenges = device.challenge.objects.filter(token=request.auth)
+
+        if device.dispatchable:
+            queryset = challenges.select_related("device")
+            return get_object_or_404(
+                queryset, device__user=request.user, confirm=False
+            )
+
+        fields = device.challenge._meta.concrete_fields
+        challenges = challenges.filter(device=OuterRef("pk"))
+
+        instance = device.objects.filter(user=request.user).annotate(**{
+            "challenge_" + field.attname: Subquery(
+                challenges.values(field.name)
+            )
+            for field in fields
+        }).first()
+
+        if instance is None:
+            raise NotFound("The requested device could not be found.")
+
+        values = [getattr(instance, "challenge_" + f.attname) for f in fields]
+
+        if values[fields.index(device.challenge._meta.pk)] is None:
+            challenge = device.challenge(token=request.auth)
+
+        else:
+            challenge = device.challenge.from_db(
+                instance._state.db, [f.attname for f in fields], values
+            )
+
+        challenge.device = instance
+        return challenge
+
+    def save_challenge(self, challenge):
+        """
+        Store a verified challenge.
+
+        New challenges are inserted, existing challenges are updated
+        with every field because verifying could change more than the
+        confirmation.
+
+        :param challenge: The verified challenge
+        :type challenge: rest_multi_factor.models.Challenge
+        """
+        challenge.save(force_insert=challenge._state.adding)
+
     def get_value(self, request):
         """
         Extract the value that needs to be verified from a request.
@@ -259,18 +343,35 @@ class MultiFactorVerifierViewSet(DeviceMixin, ViewSet):
         """
         Clear the cache of the verification throttlers.
 
-        :param classes: The throttle classes to clear
+        :param classes: The throttle instances to clear
         :type classes: iterable
 
         :param request: The current request instance
         :type request: rest_framework.request.Request
         """
-        throttles = (
-            c for c in classes if isinstance(c, AbstractDelayingThrottle)
-        )
+        ThrottleCoordinator(list(classes)).clear(request)
+
+    def check_throttles(self, request):
+        """
+        Check if the request should be throttled.
+
+        Overridden so the throttles are evaluated with batched cache
+        operations by the ThrottleCoordinator.
+
+        :param request: The current request instance
+        :type request: rest_framework.request.Request
+
+        :raises rest_framework.exceptions.Throttled: If the request
+        is throttled.
+        """
+        coordinator = ThrottleCoordinator(self.get_throttles())
+        rejected = coordinator.check(request, self)
+
+        if rejected:
+            durations = (throttle.wait() for throttle in rejected)
+            durations = [d for d in durations if d is not None]
 
-        for klass in throttles:
-            klass.clear(request)
+            self.throttled(request, max(durations, default=None))
 
     def get_throttles(self):
         """
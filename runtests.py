@@ -20,6 +20,8 @@ settings.configure(
         "rest_framework.authtoken",
 
         "rest_multi_factor",
+        "rest_multi_factor.plugins.hotp",
+        "rest_multi_factor.plugins.totp",
     ],
 
     DATABASES={
@@ -31,6 +33,9 @@ settings.configure(
 
     AUTH_USER_MODEL="auth.User",
 
+    # the plugins ship without migrations, so create their tables directly
+    MIGRATION_MODULES={"hotp": None, "totp": None},
+
     PASSWORD_HASHERS=(
         'django.contrib.auth.hashers.MD5PasswordHasher',
     ),
@@ -46,6 +51,10 @@ if __name__ == "__main__":
     setup()
 
     runner = get_runner(settings)
-    errors = runner().run_tests(["tests"])
+    errors = runner().run_tests([
+        "tests",
+        "rest_multi_factor.plugins.hotp",
+        "rest_multi_factor.plugins.totp",
+    ])
 
     sys.exit(1 if errors else 0)
@@ -9,13 +9,18 @@ __all__ = (
 
     "BasicModel",
     "EncryptedModel",
+    "LazyEncryptedModel",
+
+    "UUIDModel",
+    "UUIDRelatedModel",
 )
 
 import os
+import uuid
 import binascii
 
 from django.db.models.base import Model
-from django.db.models.fields import CharField
+from django.db.models.fields import CharField, UUIDField
 from django.db.models.fields.related import CASCADE, ForeignKey
 
 from rest_multi_factor.fields import EncryptedField
@@ -49,6 +54,30 @@ class EncryptedModel(Model):
     text = EncryptedField(max_length=255)
 
 
+class UUIDModel(Model):
+    """
+    Model with a non-integer primary key.
+    """
+
+    id = UUIDField(primary_key=True, default=uuid.uuid4)
+
+
+class UUIDRelatedModel(Model):
+    """
+    Model that relates to a non-integer primary key.
+    """
+
+    parent = ForeignKey(UUIDModel, on_delete=CASCADE)
+
+
+class LazyEncryptedModel(Model):
+    """
+    Test model for the lazy EncryptedField.
+    """
+
+    text = EncryptedField(max_length=255, lazy=True)
+
+
 class PSDevice(Device):
     """Pre-Shared value Device."""
 
@@ -1,12 +1,15 @@
 """Tests for the OTP-algorithms."""
 
-from unittest.mock import patch
+import hashlib
+
+from unittest.mock import Mock, patch
 
 from rest_framework.test import APITestCase
 
 from rest_multi_factor.exceptions import RFCGuidanceWarning
 from rest_multi_factor.exceptions import RFCGuidanceException
 from rest_multi_factor.algorithms.hotp import HOTPAlgorithm
+from rest_multi_factor.algorithms.hotp import KeyedHOTPAlgorithm
 from rest_multi_factor.algorithms.totp import TOTPAlgorithm
 
 
@@ -36,6 +39,113 @@ class AlgorithmTests(APITestCase):
         time.time.return_value = 0X386D4380  # 1 January 2000
         self.assertEqual(algorithm.calculate(message), 839412)
 
+    @patch("rest_multi_factor.algorithms.totp.time")
+    def test_keyed_algorithms(self, time):
+        message = b"This is not really a secret"
+
+        hotp = HOTPAlgorithm()
+        keyed = hotp.bind(message)
+
+        for counter in range(0, 5):
+            self.assertEqual(
+                keyed.calculate(counter), hotp.calculate(message, counter)
+            )
+
+        totp = TOTPAlgorithm()
+        keyed = totp.bind(message)
+
+        time.time.return_value = 0X386D4380  # 1 January 2000
+        for drift in range(-2, 3):
+            self.assertEqual(
+                keyed.calculate(drift), totp.calculate(message, drift=drift)
+            )
+
+        self.assertRaises(RFCGuidanceException, hotp.bind, b"foorbar")
+        self.assertRaises(RFCGuidanceException, totp.bind, b"foorbar")
+
+    @patch("rest_multi_factor.algorithms.totp.time")
+    def test_window_verification(self, time):
+        message = b"This is not really a secret"
+
+        algorithm = HOTPAlgorithm()
+        counters = range(0, 3)
+
+        self.assertEqual(algorithm.verify_window(message, 403640, counters), 2)
+        matched = algorithm.verify_window(message, "863514", counters)
+        self.assertEqual(matched, 1)
+        self.assertIsNone(algorithm.verify_window(message, 123456, counters))
+        self.assertIsNone(algorithm.verify_window(message, "foobar", counters))
+
+        algorithm = TOTPAlgorithm()
+
+        time.time.return_value = 0X386D4380  # 1 January 2000
+        for drift in range(-2, 3):
+            value = algorithm.calculate(message, drift=drift)
+            self.assertEqual(algorithm.verify_window(message, value, 2), drift)
+
+        value = algorithm.calculate(message, drift=3)
+        self.assertIsNone(algorithm.verify_window(message, value, 2))
+
+    def test_rfc_6238_vectors(self):
+        """The test vectors of RFC 6238 appendix B."""
+        secret = b"12345678901234567890"
+        vectors = {
+            59: (94287082, 46119246, 90693936),
+            1111111109: (7081804, 68084774, 25091201),
+            20000000000: (65353130, 77737706, 47863826),
+        }
+
+        for moment, expected in vectors.items():
+            algorithm = TOTPAlgorithm(clock=lambda: moment)
+
+            for value, digest, size in zip(expected, (
+                hashlib.sha1, hashlib.sha256, hashlib.sha512
+            ), (20, 32, 64)):
+                key = (secret * 4)[:size]
+                calculated = algorithm.calculate(
+                    key, digits=8, algorithm=digest
+                )
+
+                self.assertEqual(calculated, value, (moment, digest))
+
+    def test_clock_injection(self):
+        message = b"This is not really a secret"
+
+        clock = Mock(return_value=0X386D4380)  # 1 January 2000
+        algorithm = TOTPAlgorithm(clock)
+
+        self.assertEqual(algorithm.calculate(message), 839412)
+        self.assertEqual(clock.call_count, 1)
+
+        # the clock is read once for the whole window
+        clock.reset_mock()
+        clock.side_effect = [0X386D4380, 0X386D4380 + 30]
+
+        value = algorithm.calculate(message, drift=2)
+        self.assertEqual(algorithm.verify_window(message, value, 2), 1)
+        self.assertEqual(clock.call_count, 2)
+
+    def test_constant_time_verification(self):
+        message = b"This is not really a secret"
+        keyed = HOTPAlgorithm().bind(message)
+
+        with patch.object(KeyedHOTPAlgorithm, "_calculate", autospec=True,
+                          side_effect=KeyedHOTPAlgorithm._calculate) as mock:
+            matched = keyed.verify_window(863514, range(0, 5), True)
+
+            self.assertEqual(matched, 1)
+            self.assertEqual(mock.call_count, 5)
+
+            mock.reset_mock()
+            matched = keyed.verify_window(863514, range(0, 5), False)
+
+            self.assertEqual(matched, 1)
+            self.assertEqual(mock.call_count, 2)
+
+        self.assertEqual(keyed.verify_window("403640", range(0, 3), True), 2)
+        self.assertIsNone(keyed.verify_window(123456, range(0, 3), True))
+        self.assertIsNone(keyed.verify_window(1403640, range(0, 3), True))
+
     def test_RFC_checks(self):
         algorithm = HOTPAlgorithm()
 
@@ -1,9 +1,17 @@
 """Test the validation backends."""
 
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from django.db import transaction
+from django.core.cache import cache
 from django.test import override_settings
 
-from rest_framework.test import APITestCase
+from rest_framework.test import APITestCase, APITransactionTestCase
 
+from rest_multi_factor.models import VerificationCounter
+from rest_multi_factor.permissions import IsVerifiedOrNoDevice
+from rest_multi_factor.backends import CachedBackend, CounterBackend
 from rest_multi_factor.backends import DefaultBackend
 
 from rest_multi_factor.factories.user import UserFactory
@@ -53,3 +61,170 @@ class BackendTests(APITestCase):
 
         pre_shared_device.delete()
         dispatchable_device.delete()
+
+    @override_settings(REST_MULTI_FACTOR={
+        "DEFAULT_BACKEND_CLASS": "rest_multi_factor.backends.CounterBackend",
+    })
+    def test_counter_backend(self):
+        backend = CounterBackend()
+        counter = VerificationCounter.objects.filter(token=self.auth)
+
+        # tokens from before the backend was configured
+        self.assertFalse(counter.exists())
+        self.assertEqual(backend.verify(self.auth, None), 1)
+
+        device = PSDeviceFactory(user=self.user)
+        challenge = PSChallengeFactory(token=self.auth, device=device)
+        self.assertFalse(counter.exists())
+
+        challenge.confirm = True
+        challenge.save()
+        challenge.save()
+
+        self.assertEqual(counter.get().confirmed, 1)
+
+        with self.assertNumQueries(1):
+            self.assertEqual(backend.verify(self.auth, None), 0)
+
+        device.delete()
+        self.assertEqual(counter.get().confirmed, 0)
+
+        auth = AuthFactory(user=UserFactory())
+        self.assertEqual(
+            VerificationCounter.objects.get(token=auth).confirmed, 0
+        )
+
+        auth.delete()
+
+    @override_settings(REST_MULTI_FACTOR={
+        "DEFAULT_BACKEND_CLASS": "rest_multi_factor.backends.CounterBackend",
+    })
+    @patch.object(IsVerifiedOrNoDevice, "backend_class", CounterBackend)
+    def test_counter_permission_queries(self):
+        user = UserFactory()
+        auth = AuthFactory(user=user)
+        request = SimpleNamespace(user=user, auth=auth)
+        permission = IsVerifiedOrNoDevice()
+
+        device = PSDeviceFactory(user=user)
+        challenge = PSChallengeFactory(token=auth, device=device)
+
+        # the counter lookup and the devices of the user
+        with self.assertNumQueries(2):
+            self.assertFalse(permission.has_permission(request, None))
+
+        challenge.confirm = True
+        challenge.save()
+
+        with self.assertNumQueries(1):
+            self.assertTrue(permission.has_permission(request, None))
+
+    def test_counter_updates(self):
+        backend = CounterBackend()
+        counter = VerificationCounter.objects.filter(token=self.auth)
+        get_or_create = VerificationCounter.objects.get_or_create
+
+        def create_concurrently(**kwargs):
+            # another update created the counter before this change
+            return get_or_create(token=kwargs["token"])[0], False
+
+        with patch.object(
+                VerificationCounter.objects,
+                "get_or_create",
+                side_effect=create_concurrently):
+            backend.update_confirmed(self.auth, 1)
+
+        self.assertEqual(counter.get().confirmed, 1)
+
+        backend.update_confirmed(self.auth, -1)
+        backend.update_confirmed(self.auth, -1)
+
+        self.assertEqual(counter.get().confirmed, 0)
+
+
+@override_settings(REST_MULTI_FACTOR={
+    "DEFAULT_BACKEND_CLASS": "rest_multi_factor.backends.CachedBackend",
+})
+class CachedBackendTests(APITransactionTestCase):
+    """The cache is invalidated on commit, so this needs transactions."""
+
+    def setUp(self):
+        """Set up the test data."""
+        cache.clear()
+
+        self.user = UserFactory()
+        self.auth = AuthFactory(user=self.user)
+
+    def test_cached_backend(self):
+        device = PSDeviceFactory(user=self.user)
+        challenge = PSChallengeFactory(token=self.auth, device=device)
+
+        backend = CachedBackend()
+        self.assertEqual(backend.verify(self.auth, None), 1)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(backend.verify(self.auth, None), 1)
+
+        challenge.confirm = True
+        challenge.save()
+
+        self.assertEqual(backend.verify(self.auth, None), 0)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(backend.verify(self.auth, None), 0)
+
+        challenge.delete()
+        self.assertEqual(backend.verify(self.auth, None), 1)
+
+        device.delete()
+
+    def test_invalidate_on_commit(self):
+        device = PSDeviceFactory(user=self.user)
+        challenge = PSChallengeFactory(token=self.auth, device=device)
+
+        backend = CachedBackend()
+        self.assertEqual(backend.verify(self.auth, None), 1)
+
+        key = backend.get_cache_key(self.auth)
+
+        with transaction.atomic():
+            challenge.confirm = True
+            challenge.save()
+
+            self.assertEqual(cache.get(key), 0)
+
+        self.assertEqual(cache.get(key), 1)
+        self.assertEqual(backend.verify(self.auth, None), 0)
+
+        self.auth.delete()
+        self.assertEqual(cache.get(key), 0)
+
+    def test_stale_check(self):
+        device = PSDeviceFactory(user=self.user)
+        challenge = PSChallengeFactory(token=self.auth, device=device)
+
+        backend = CachedBackend()
+        key = backend.get_cache_key(self.auth)
+
+        counted = []
+        get_confirmed = DefaultBackend.get_confirmed
+
+        def stale(token):
+            if counted:
+                return get_confirmed(backend, token)
+
+            # the change is committed while the check counts
+            counted.append(token)
+
+            challenge.confirm = True
+            challenge.save()
+
+            return 0
+
+        cache.clear()
+
+        with patch.object(DefaultBackend, "get_confirmed", side_effect=stale):
+            self.assertEqual(backend.verify(self.auth, None), 1)
+
+        self.assertEqual(cache.get(key), 1)
+        self.assertEqual(backend.verify(self.auth, None), 0)
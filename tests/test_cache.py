@@ -0,0 +1,44 @@
+"""Tests for the per process caches."""
+
+from unittest import TestCase
+
+from rest_multi_factor.cache import LocalCache
+
+
+class LocalCacheTests(TestCase):
+    """Tests for the bounded local cache."""
+
+    def setUp(self):
+        """Prepare the test case with a controllable clock."""
+        self.now = 0
+        self.cache = LocalCache(2, 10, timer=lambda: self.now)
+
+    def test_expiration(self):
+        """Test that entries expire after their timeout."""
+        self.cache.set("a", 1)
+        self.cache.set("b", 2, timeout=20)
+
+        self.now = 10
+        self.assertIsNone(self.cache.get("a"))
+        self.assertEqual(self.cache.get("b"), 2)
+
+        self.now = 20
+        self.assertEqual(self.cache.get("b", 3), 3)
+        self.assertEqual(len(self.cache), 0)
+
+    def test_eviction(self):
+        """Test that the least recently used entry is evicted."""
+        self.cache.set("a", 1)
+        self.cache.set("b", 2)
+        self.cache.get("a")
+        self.cache.set("c", 3)
+
+        self.assertEqual(self.cache.get("a"), 1)
+        self.assertIsNone(self.cache.get("b"))
+        self.assertEqual(self.cache.get("c"), 3)
+
+        self.cache.delete("a")
+        self.assertIsNone(self.cache.get("a"))
+
+        self.cache.clear()
+        self.assertEqual(len(self.cache), 0)
@@ -0,0 +1,119 @@
+"""Tests for the encryption classes."""
+
+from io import StringIO
+
+from django.db import connection
+from django.test import override_settings
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from cryptography.fernet import InvalidToken
+
+from rest_framework.test import APITestCase
+
+from rest_multi_factor.encryption import AESEncryption, RotatingAESEncryption
+
+from tests.models import EncryptedModel
+
+
+class AESEncryptionTests(APITestCase):
+    """Tests for the AES encryption."""
+
+    def test_encryption(self):
+        """Test a encryption and decryption round trip."""
+        encryption = AESEncryption()
+
+        encrypted = encryption.encrypt(b"foobar")
+
+        self.assertNotEqual(encrypted, b"foobar")
+        self.assertEqual(encryption.decrypt(encrypted), b"foobar")
+
+    def test_cached_suit(self):
+        """Test that the Fernet suit is shared between instances."""
+        self.assertIs(AESEncryption().key, AESEncryption().key)
+        self.assertIs(AESEncryption().fernet, AESEncryption().fernet)
+
+    def test_secret_key_change(self):
+        """Test that a new SECRET_KEY results in a new key."""
+        encryption = AESEncryption()
+
+        key = encryption.key
+        encrypted = encryption.encrypt(b"foobar")
+
+        with override_settings(SECRET_KEY="Another not really secret key"):
+            self.assertNotEqual(encryption.key, key)
+            self.assertRaises(InvalidToken, encryption.decrypt, encrypted)
+
+        self.assertEqual(encryption.key, key)
+        self.assertEqual(encryption.decrypt(encrypted), b"foobar")
+
+
+ROTATING_SETTINGS = {
+    "DEFAULT_ENCRYPTION_CLASS":
+        "rest_multi_factor.encryption.RotatingAESEncryption",
+    "ENCRYPTION_KEYS": ("A new secret key", "Not really secret during tests"),
+}
+
+
+class RotatingAESEncryptionTests(APITestCase):
+    """Tests for the rotating AES encryption."""
+
+    def test_fallback(self):
+        """Test that the SECRET_KEY is used without configured keys."""
+        self.assertEqual(RotatingAESEncryption().keys, (AESEncryption().key,))
+
+    @override_settings(REST_MULTI_FACTOR=ROTATING_SETTINGS)
+    def test_rotation(self):
+        """Test decryption with old keys and encryption with the newest."""
+        encryption = RotatingAESEncryption()
+        previous = AESEncryption().encrypt(b"foobar")
+
+        self.assertEqual(encryption.decrypt(previous), b"foobar")
+        self.assertTrue(encryption.needs_rotation(previous))
+
+        encrypted = encryption.encrypt(b"foobar")
+
+        self.assertFalse(encryption.needs_rotation(encrypted))
+        self.assertRaises(InvalidToken, AESEncryption().decrypt, encrypted)
+
+    def test_unsupported_command(self):
+        """Test the command without a rotating encryption class."""
+        self.assertRaises(
+            CommandError, call_command, "rotate_encryption_keys"
+        )
+
+    def test_command(self):
+        """Test that the command re-encrypts values with the newest key."""
+        EncryptedModel.objects.bulk_create(
+            EncryptedModel(text=b"foobar") for _ in range(0, 5)
+        )
+
+        with override_settings(REST_MULTI_FACTOR=ROTATING_SETTINGS):
+            output = StringIO()
+            call_command(
+                "rotate_encryption_keys", batch_size=2, stdout=output
+            )
+
+            self.assertIn(
+                "5/5 rows checked, 5 re-encrypted", output.getvalue()
+            )
+
+            encryption = RotatingAESEncryption()
+            cursor = connection.cursor()
+            cursor.execute("SELECT text FROM tests_encryptedmodel")
+
+            for stored, in cursor.fetchall():
+                self.assertFalse(encryption.needs_rotation(stored.encode()))
+
+            cursor.close()
+
+            self.assertEqual(
+                [i.text for i in EncryptedModel.objects.all()], [b"foobar"] * 5
+            )
+
+            output = StringIO()
+            call_command("rotate_encryption_keys", stdout=output)
+
+            self.assertIn(
+                "5/5 rows checked, 0 re-encrypted", output.getvalue()
+            )
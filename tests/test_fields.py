@@ -1,12 +1,17 @@
 """Tests for custom fields."""
 
+from unittest.mock import patch
+
 from django.db import connection
+from django.test import override_settings
 
 from rest_framework.test import APITestCase
 
+from rest_multi_factor.fields import Ciphertext
 from rest_multi_factor.settings import multi_factor_settings
+from rest_multi_factor.encryption import AESEncryption
 
-from tests.models import EncryptedModel
+from tests.models import EncryptedModel, LazyEncryptedModel
 
 
 class FieldsTest(APITestCase):
@@ -59,3 +64,71 @@ class FieldsTest(APITestCase):
 
         instance = EncryptedModel.objects.last()
         self.assertEqual(instance.text, message)
+
+    def test_lazy_encrypted_field_decryption(self):
+        """
+        Validate that a lazy EncryptedField is only decrypted
+        on first access and that the result is cached.
+        """
+        message = b"foobar"
+        LazyEncryptedModel.objects.create(text=message)
+
+        with patch.object(AESEncryption, "decrypt", autospec=True,
+                          side_effect=AESEncryption.decrypt) as decrypt:
+            instance = LazyEncryptedModel.objects.last()
+            self.assertEqual(decrypt.call_count, 0)
+
+            self.assertEqual(instance.text, message)
+            self.assertEqual(instance.text, message)
+            self.assertEqual(decrypt.call_count, 1)
+
+            instance = LazyEncryptedModel.objects.only("id").last()
+            self.assertEqual(instance.text, message)
+
+    def test_lazy_encrypted_field_storage(self):
+        """
+        Validate that a lazy EncryptedField that isn't accessed
+        is stored without being encrypted again.
+        """
+        instance = LazyEncryptedModel.objects.create(text=b"foobar")
+        queryset = LazyEncryptedModel.objects.filter(pk=instance.pk)
+
+        stored = queryset.values_list("text", flat=True).get()
+
+        self.assertIsInstance(stored, Ciphertext)
+        self.assertEqual(self.encryption.decrypt(stored), b"foobar")
+
+        queryset.get().save()
+        self.assertEqual(queryset.values_list("text", flat=True).get(), stored)
+
+        instance = queryset.get()
+        instance.text = b"barfoo"
+        instance.save()
+
+        self.assertEqual(queryset.get().text, b"barfoo")
+
+    @override_settings(REST_MULTI_FACTOR={"ENCRYPTION_CACHE_SIZE": 8})
+    def test_lazy_encrypted_field_cache(self):
+        """
+        Validate that decrypted values of lazy EncryptedFields are
+        shared between instances until the stored value changes.
+        """
+        instance = LazyEncryptedModel.objects.create(text=b"foobar")
+        queryset = LazyEncryptedModel.objects.filter(pk=instance.pk)
+
+        with patch.object(AESEncryption, "decrypt", autospec=True,
+                          side_effect=AESEncryption.decrypt) as decrypt:
+            self.assertEqual(queryset.get().text, b"foobar")
+            self.assertEqual(queryset.get().text, b"foobar")
+            self.assertEqual(decrypt.call_count, 1)
+
+            instance.text = b"barfoo"
+            instance.save()
+
+            self.assertEqual(queryset.get().text, b"barfoo")
+            self.assertEqual(decrypt.call_count, 2)
+
+            queryset.update(text=b"foobar")
+
+            self.assertEqual(queryset.get().text, b"foobar")
+            self.assertEqual(decrypt.call_count, 3)
@@ -0,0 +1,44 @@
+"""Tests for the viewset mixins."""
+
+from django.test import TestCase
+
+from rest_multi_factor.mixins import DeviceMixin
+
+from rest_multi_factor.factories.user import UserFactory
+from rest_multi_factor.factories.devices import DiDeviceFactory
+
+from tests.models import DiDevice
+
+
+class DeviceMixinTests(TestCase):
+    """Tests for the DeviceMixin."""
+
+    def setUp(self):
+        """Prepare the test case."""
+        self.user = UserFactory()
+        self.mixin = DeviceMixin()
+
+    def test_user_devices(self):
+        """Test that all device tables are checked with a single query."""
+        devices = self.mixin.get_devices()
+        index = devices.index(DiDevice)
+
+        with self.assertNumQueries(1):
+            self.assertEqual(self.mixin.get_user_device_bitmap(self.user), 0)
+
+        DiDeviceFactory(user=self.user)
+
+        with self.assertNumQueries(1):
+            filled = self.mixin.get_user_devices(self.user, fill=True)
+
+        self.assertEqual(len(filled), len(devices))
+        self.assertEqual(filled[index], DiDevice)
+        self.assertEqual(filled.count(None), len(devices) - 1)
+
+        with self.assertNumQueries(1):
+            found = self.mixin.get_user_devices(self.user)
+
+        self.assertEqual(found, (DiDevice,))
+
+        device = self.mixin.get_user_device(self.user, index)
+        self.assertEqual(device, DiDevice)
@@ -1,5 +1,9 @@
 """Tests for permissions."""
 
+from types import SimpleNamespace
+
+from django.contrib.auth.models import AnonymousUser
+
 from rest_framework import status
 from rest_framework.test import APIRequestFactory, APITestCase
 from rest_framework.generics import ListCreateAPIView
@@ -175,3 +179,35 @@ class PermissionIntegrationTest(APITestCase):
         response = no_device_overview_view(request)
         self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
         device.delete()
+
+    def test_permission_queries(self):
+        anonymous = SimpleNamespace(user=AnonymousUser(), auth=None)
+        request = SimpleNamespace(user=self.user, auth=self.auth)
+
+        with self.assertNumQueries(0):
+            self.assertFalse(IsVerified().has_permission(anonymous, None))
+            self.assertFalse(
+                IsVerifiedOrNoDevice().has_permission(anonymous, None)
+            )
+
+        device = PSDeviceFactory(user=self.user)
+        logger = "rest_multi_factor.permissions"
+
+        with self.assertNumQueries(1), self.assertLogs(logger, "DEBUG") as cm:
+            self.assertFalse(
+                IsVerifiedOrNoDevice().has_permission(request, None)
+            )
+
+        self.assertEqual(cm.output, [
+            "DEBUG:{0}:IsVerifiedOrNoDevice.has_permission "
+            "executed 1 queries".format(logger)
+        ])
+
+        PSChallengeFactory(token=self.auth, device=device, confirm=True)
+
+        with self.assertNumQueries(1):
+            self.assertTrue(
+                IsVerifiedOrNoDevice().has_permission(request, None)
+            )
+
+        device.delete()
@@ -1,10 +1,11 @@
 """Tests for everything that is defined within throttling.py."""
 
 from urllib.parse import quote
-from unittest.mock import patch
+from unittest.mock import Mock, patch
 
 from django.core.cache import cache as default_cache
 from django.core.exceptions import ImproperlyConfigured
+from django.test import override_settings
 
 from rest_framework.test import force_authenticate
 from rest_framework.test import APIRequestFactory, APITestCase
@@ -17,6 +18,9 @@ from rest_framework.response import Response
 from rest_multi_factor.throttling import SimpleDelayingThrottle
 from rest_multi_factor.throttling import AbstractDelayingThrottle
 from rest_multi_factor.throttling import RecursiveDelayingThrottle
+from rest_multi_factor.throttling import FixedWindowDelayingThrottle
+from rest_multi_factor.throttling import ThrottleConfig, get_throttle_config
+from rest_multi_factor.throttling import ThrottleCoordinator
 
 from rest_multi_factor.factories.user import UserFactory
 from rest_multi_factor.factories.auth import AuthFactory
@@ -47,8 +51,16 @@ class RecursiveDelayedView(APIView):
         return Response("foobar")
 
 
+class FixedWindowDelayedView(APIView):
+    throttle_classes = (FixedWindowDelayingThrottle,)
+
+    def post(self, request):
+        return Response("foobar")
+
+
 simple_delayed_view = SimpleDelayedView.as_view()
 recursive_delayed_view = RecursiveDelayedView.as_view()
+fixed_window_delayed_view = FixedWindowDelayedView.as_view()
 
 
 class AbstractedThrottleBaseTests(APITestCase):
@@ -74,6 +86,20 @@ class AbstractedThrottleBaseTests(APITestCase):
         instance.clear(Request(request))
         self.assertEqual(instance.cache.get_or_set(identity, 2), 2)
 
+    def test_history_encoding(self):
+        """
+        Test that histories are stored in a fixed size and that
+        histories from previous versions can be decoded.
+        """
+        instance = AbstractDelayingThrottleBase()
+        encoded = instance.encode_history(3, 1500.5)
+
+        self.assertEqual(len(encoded), 12)
+        self.assertEqual(instance.decode_history(encoded), (3, 1500.5))
+        self.assertEqual(instance.decode_history(None), (0, 0.0))
+        self.assertEqual(instance.decode_history(()), (0, 0.0))
+        self.assertEqual(instance.decode_history((1.0, 2.0)), (2, 2.0))
+
     def test_unauthenticated_identity_generation(self):
         factory = APIRequestFactory()
         request = factory.post("/")
@@ -141,6 +167,23 @@ class AbstractedThrottleBaseTests(APITestCase):
                     throttle.parse_timeout(string.upper()), result
                 )
 
+    def test_shared_configuration(self):
+        """
+        Test that the configuration is parsed once and reloaded
+        with the settings.
+        """
+        config = get_throttle_config()
+
+        self.assertEqual(config, ThrottleConfig(5, 30, ("token",)))
+        self.assertIs(AbstractDelayingThrottleBase().get_config(), config)
+
+        with override_settings(REST_MULTI_FACTOR={
+            "VERIFICATION_THROTTLE_TIMEOUT": "1m",
+        }):
+            self.assertEqual(RecursiveDelayingThrottle().get_timeout(), 60)
+
+        self.assertEqual(SimpleDelayingThrottle().get_timeout(), 30)
+
     def test_unsuccessful_timeout_parsing(self):
         """
         Boundary checks for parsing the time.
@@ -223,3 +266,241 @@ class ThrottlingIntegrationTests(APITestCase):
             self.assertEqual(1, int(response["Retry-After"]))
 
             timer.return_value += 1.00
+
+    @patch.object(FixedWindowDelayingThrottle, "timer")
+    def test_fixed_window_delaying_throttle(self, timer):
+        """
+        Test that five requests are allowed per window, that the
+        next window starts fresh and that clearing resets the count.
+
+        :param timer: The mock of the throttlers timer
+        :type timer: unittest.mock.MagicMock
+        """
+        factory = APIRequestFactory()
+        request = factory.post("/")
+
+        force_authenticate(request, self.user, self.auth)
+
+        timer.return_value = 3000.00
+
+        for window in range(0, 2):
+            for i in range(0, 5):
+                response = fixed_window_delayed_view(request)
+                self.assertEqual(response.status_code, HTTP_200_OK)
+
+            timer.return_value += 10.00
+
+            response = fixed_window_delayed_view(request)
+            self.assertEqual(response.status_code, HTTP_429_TOO_MANY_REQUESTS)
+            self.assertEqual(int(response["Retry-After"]), 20)
+
+            timer.return_value += 20.00
+
+        FixedWindowDelayingThrottle.clear(Request(request))
+
+        response = fixed_window_delayed_view(request)
+        self.assertEqual(response.status_code, HTTP_200_OK)
+
+        for i in range(0, 5):
+            fixed_window_delayed_view(request)
+
+        FixedWindowDelayingThrottle.clear(Request(request))
+
+        response = fixed_window_delayed_view(request)
+        self.assertEqual(response.status_code, HTTP_200_OK)
+
+    @patch.object(RecursiveDelayingThrottle, "timer")
+    @override_settings(REST_MULTI_FACTOR={
+        "VERIFICATION_THROTTLE_LOCAL_CACHE_SIZE": 16,
+    })
+    def test_local_throttle_cache(self, timer):
+        """
+        Test that rejections are answered from the local cache while
+        the wait period hasn't elapsed.
+
+        :param timer: The mock of the throttlers timer
+        :type timer: unittest.mock.MagicMock
+        """
+        factory = APIRequestFactory()
+        request = factory.post("/")
+
+        force_authenticate(request, self.user, self.auth)
+
+        timer.return_value = 0.00
+        cache = Mock(wraps=default_cache)
+
+        with patch.object(RecursiveDelayingThrottle, "cache", cache):
+            response = recursive_delayed_view(request)
+            self.assertEqual(response.status_code, HTTP_200_OK)
+
+            response = recursive_delayed_view(request)
+            self.assertEqual(response.status_code, HTTP_429_TOO_MANY_REQUESTS)
+            self.assertEqual(cache.get_many.call_count, 2)
+
+            for i in range(0, 3):
+                timer.return_value += 5.00
+
+                response = recursive_delayed_view(request)
+                self.assertEqual(
+                    response.status_code, HTTP_429_TOO_MANY_REQUESTS
+                )
+                self.assertEqual(int(response["Retry-After"]), 25 - i * 5)
+
+            self.assertEqual(cache.get_many.call_count, 2)
+
+            timer.return_value += 15.00
+
+            response = recursive_delayed_view(request)
+            self.assertEqual(response.status_code, HTTP_200_OK)
+            self.assertEqual(cache.get_many.call_count, 3)
+            self.assertEqual(cache.set_many.call_count, 2)
+
+    @patch.object(SimpleDelayingThrottle, "timer")
+    @override_settings(REST_MULTI_FACTOR={
+        "VERIFICATION_THROTTLE_SCOPES": ("token", "user", "ip"),
+    })
+    def test_identity_scopes(self, timer):
+        """
+        Test that new tokens of the same user don't get a fresh budget
+        and that clearing keeps the budget of the IP address.
+
+        :param timer: The mock of the throttlers timer
+        :type timer: unittest.mock.MagicMock
+        """
+        timer.return_value = 0.00
+        factory = APIRequestFactory()
+
+        # every request is made with a different token of the same user
+        for i in range(0, 5):
+            request = factory.post("/")
+            force_authenticate(request, self.user, "token{0}".format(i))
+
+            response = simple_delayed_view(request)
+            self.assertEqual(response.status_code, HTTP_200_OK)
+
+        request = factory.post("/")
+        force_authenticate(request, self.user, "token5")
+
+        response = simple_delayed_view(request)
+        self.assertEqual(response.status_code, HTTP_429_TOO_MANY_REQUESTS)
+
+        SimpleDelayingThrottle.clear(Request(request))
+
+        response = simple_delayed_view(request)
+        self.assertEqual(response.status_code, HTTP_429_TOO_MANY_REQUESTS)
+
+        throttle = SimpleDelayingThrottle()
+        identifiers = throttle.get_idents(Request(request))
+
+        self.assertEqual(len(identifiers), 3)
+        self.assertEqual(identifiers[0], throttle.get_ident(Request(request)))
+        self.assertEqual(identifiers[1], quote(
+            "auth user {0}".format(self.user.pk)
+        ))
+        self.assertEqual(identifiers[2], quote("auth ip 127.0.0.1"))
+
+    @patch.object(FixedWindowDelayingThrottle, "timer")
+    @override_settings(REST_MULTI_FACTOR={
+        "VERIFICATION_THROTTLE_SCOPES": ("token", "user", "ip"),
+    })
+    def test_fixed_window_identity_scopes(self, timer):
+        """
+        Test that the windows are counted for every identity scope
+        and that clearing keeps the count of the IP address.
+
+        :param timer: The mock of the throttlers timer
+        :type timer: unittest.mock.MagicMock
+        """
+        timer.return_value = 3000.00
+        factory = APIRequestFactory()
+
+        # every request is made with a different token of the same user
+        for i in range(0, 5):
+            request = factory.post("/")
+            force_authenticate(request, self.user, "token{0}".format(i))
+
+            response = fixed_window_delayed_view(request)
+            self.assertEqual(response.status_code, HTTP_200_OK)
+
+        request = factory.post("/")
+        force_authenticate(request, self.user, "token5")
+
+        response = fixed_window_delayed_view(request)
+        self.assertEqual(response.status_code, HTTP_429_TOO_MANY_REQUESTS)
+
+        FixedWindowDelayingThrottle.clear(Request(request))
+
+        response = fixed_window_delayed_view(request)
+        self.assertEqual(response.status_code, HTTP_429_TOO_MANY_REQUESTS)
+
+        timer.return_value += 30.00
+
+        response = fixed_window_delayed_view(request)
+        self.assertEqual(response.status_code, HTTP_200_OK)
+
+    @patch.object(SimpleDelayingThrottle, "timer")
+    @override_settings(REST_MULTI_FACTOR={
+        "VERIFICATION_THROTTLE_SCOPES": ("device",),
+    })
+    def test_device_scope_fallback(self, timer):
+        """
+        Test that requests without a device index fall back to the
+        token scope when only the device scope is configured.
+
+        :param timer: The mock of the throttlers timer
+        :type timer: unittest.mock.MagicMock
+        """
+        timer.return_value = 0.00
+        factory = APIRequestFactory()
+        request = factory.post("/")
+
+        force_authenticate(request, self.user, self.auth)
+
+        throttle = SimpleDelayingThrottle()
+        self.assertEqual(
+            throttle.get_idents(Request(request)),
+            [throttle.get_ident(Request(request))]
+        )
+
+        for i in range(0, 5):
+            response = simple_delayed_view(request)
+            self.assertEqual(response.status_code, HTTP_200_OK)
+
+        response = simple_delayed_view(request)
+        self.assertEqual(response.status_code, HTTP_429_TOO_MANY_REQUESTS)
+
+    @patch.object(SimpleDelayingThrottle, "timer")
+    @patch.object(RecursiveDelayingThrottle, "timer")
+    def test_throttle_coordinator(self, recursive_timer, simple_timer):
+        """
+        Test that stacked throttles share their cache round trips.
+
+        :param recursive_timer: The mock of the recursive throttle timer
+        :type recursive_timer: unittest.mock.MagicMock
+
+        :param simple_timer: The mock of the simple throttle timer
+        :type simple_timer: unittest.mock.MagicMock
+        """
+        factory = APIRequestFactory()
+        request = Request(factory.post("/"))
+        request.user, request.auth = self.user, self.auth
+
+        recursive_timer.return_value = simple_timer.return_value = 0.00
+        cache = Mock(wraps=default_cache)
+
+        with patch.object(SimpleDelayingThrottle, "cache", cache), \
+                patch.object(RecursiveDelayingThrottle, "cache", cache):
+            throttles = [SimpleDelayingThrottle(), RecursiveDelayingThrottle()]
+            coordinator = ThrottleCoordinator(throttles)
+
+            self.assertEqual(coordinator.check(request, None), [])
+            self.assertEqual(coordinator.check(request, None), throttles[1:])
+
+            self.assertEqual(cache.get_many.call_count, 2)
+            self.assertEqual(cache.set_many.call_count, 2)
+            self.assertEqual(throttles[1].wait(), 30)
+
+            coordinator.clear(request)
+
+            self.assertEqual(cache.delete_many.call_count, 1)
+            self.assertEqual(coordinator.check(request, None), [])
@@ -0,0 +1,96 @@
+"""Tests for the utilities."""
+
+from unittest.mock import patch
+
+from django.apps import apps
+from django.db.models.query import Q
+from django.test import SimpleTestCase, TestCase
+
+from rest_multi_factor.models import Device
+from rest_multi_factor.utils import PreparedQuery, unify_queryset
+from rest_multi_factor.utils import QueryCounter, get_subclassed_models
+
+from rest_multi_factor.factories.user import UserFactory
+from rest_multi_factor.factories.devices import DiDeviceFactory
+
+from tests.models import DiDevice, PSDevice
+from tests.models import UUIDModel, UUIDRelatedModel
+
+
+class SubclassedModelsTests(SimpleTestCase):
+    """Tests for the discovery of sub models."""
+
+    def test_cached_discovery(self):
+        """Test that models are discovered once per app registry state."""
+        models = get_subclassed_models(Device)
+
+        self.assertIn(PSDevice, models)
+        self.assertIn(DiDevice, models)
+        self.assertIs(get_subclassed_models(Device), models)
+
+        apps.clear_cache()
+
+        self.assertIsNot(get_subclassed_models(Device), models)
+        self.assertEqual(get_subclassed_models(Device), models)
+
+
+class PreparedQueryTests(TestCase):
+    """Tests for prepared queries."""
+
+    def test_execution(self):
+        """Test that a query is compiled once and bound per execution."""
+        query = PreparedQuery(
+            lambda user: unify_queryset(Device, ("id",), Q(user=user)),
+            "user",
+        )
+
+        user = UserFactory()
+        device = DiDeviceFactory(user=user)
+
+        with self.assertNumQueries(1):
+            self.assertEqual(query.execute(user=user), [(device.pk,)])
+
+        compiled = query.compile("default")
+
+        self.assertEqual(query.execute(user=UserFactory()), [])
+        self.assertIs(query.compile("default"), compiled)
+
+        apps.clear_cache()
+
+        self.assertEqual(query.execute(user=user.pk), [(device.pk,)])
+        self.assertIsNot(query.compile("default"), compiled)
+
+    def test_field_preparation(self):
+        """Test that values are prepared like the ORM would."""
+        query = PreparedQuery(
+            lambda parent: unify_queryset(
+                UUIDRelatedModel, ("id",), Q(parent=parent),
+                models=(UUIDRelatedModel,)
+            ),
+            "parent",
+        )
+
+        parent = UUIDModel.objects.create()
+        related = UUIDRelatedModel.objects.create(parent=parent)
+
+        self.assertEqual(query.execute(parent=parent), [(related.pk,)])
+        self.assertEqual(query.execute(parent=parent.pk), [(related.pk,)])
+        self.assertEqual(query.execute(parent=UUIDModel()), [])
+
+
+class QueryCounterTests(TestCase):
+    """Tests for the query counter."""
+
+    def test_count(self):
+        """Test that queries are counted with and without wrappers."""
+        with QueryCounter() as counter:
+            list(PSDevice.objects.all())
+
+        self.assertEqual(counter.count, 1)
+
+        with patch("rest_multi_factor.utils.VERSION", (1, 11, 0)):
+            with QueryCounter() as counter:
+                list(PSDevice.objects.all())
+                list(DiDevice.objects.all())
+
+        self.assertEqual(counter.count, 2)
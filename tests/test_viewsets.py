@@ -2,8 +2,11 @@
 
 from unittest.mock import patch
 
+from django.db import connection
 from django.urls import reverse
+from django.core.cache import cache
 from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 
 from rest_framework import status
 from rest_framework.test import APIRequestFactory, force_authenticate
@@ -20,11 +23,13 @@ from rest_multi_factor.factories.user import UserFactory
 from rest_multi_factor.factories.auth import AuthFactory
 
 from rest_multi_factor.factories.devices import PSDeviceFactory
+from rest_multi_factor.factories.devices import PSChallengeFactory
 from rest_multi_factor.factories.devices import DiDeviceFactory
 from rest_multi_factor.factories.devices import DiChallengeFactory
 
 from tests.utils import get_token_string, get_token_object
 from tests.utils import basic_auth_header, token_auth_header
+from tests.utils import count_queries
 
 from tests.models import PSDevice
 
@@ -92,6 +97,29 @@ class VerifierViewSetsTest(URLPatternsTestCase, APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertDictEqual(response.data, expected)
 
+    def test_retrieve_read_only(self):
+        """
+        Test that retrieving the overview and specifics reads the
+        confirmations without creating challenges.
+        """
+        ps_device = PSDeviceFactory(user=self.user)
+        di_device = DiDeviceFactory(user=self.user)
+
+        token = get_token_object(self.auth)
+        DiChallengeFactory(device=di_device, token=token, confirm=True)
+
+        response = self.client.get(reverse("multi-factor-overview"),
+                                   HTTP_AUTHORIZATION=self.token_credentials)
+
+        confirmed = [device["confirmed"] for device in response.data]
+        self.assertEqual(confirmed, [False, True])
+
+        response = self.client.get(reverse("multi-factor-specific", args=[1]),
+                                   HTTP_AUTHORIZATION=self.token_credentials)
+
+        self.assertTrue(response.data["confirmed"])
+        self.assertFalse(type(ps_device).challenge.objects.exists())
+
     @patch.object(RecursiveDelayingThrottle, "timer")
     @override_settings(REST_MULTI_FACTOR={
         "THROTTLE_CLASSES": [SimpleDelayingThrottle],
@@ -188,6 +216,94 @@ class VerifierViewSetsTest(URLPatternsTestCase, APITestCase):
 
         device.delete()
 
+    @override_settings(REST_MULTI_FACTOR={"REQUIRED_VERIFICATIONS": 3})
+    def test_verification_queries(self):
+        """
+        Test that a verification takes at most three queries.
+        """
+        factory = APIRequestFactory()
+        token = get_token_object(self.auth)
+
+        ps_device = PSDeviceFactory(user=self.user)
+        di_device = DiDeviceFactory(user=self.user)
+
+        di_challenge = DiChallengeFactory(device=di_device, token=token)
+        di_challenge.dispatch()
+
+        def verify(index, value):
+            request = factory.post("/", {"value": value})
+            force_authenticate(request, self.user, token)
+
+            with CaptureQueriesContext(connection) as context:
+                response = multi_factor_viewset(request, index=index)
+
+            return response, count_queries(context.captured_queries)
+
+        # device with the challenge, count and insert
+        response, queries = verify(0, ps_device.value)
+
+        self.assertEqual(queries, 3)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["verifications-left"], 2)
+
+        # challenge with the device, count and update
+        response, queries = verify(1, di_challenge.value)
+
+        self.assertEqual(queries, 3)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["verifications-left"], 1)
+
+        di_challenge.refresh_from_db()
+        self.assertTrue(di_challenge.confirm)
+        self.assertIsNotNone(di_challenge.value)
+
+        # already confirmed challenges only take the first query
+        response, queries = verify(0, ps_device.value)
+
+        self.assertEqual(queries, 1)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        challenge = type(ps_device).challenge.objects.get(token=token)
+        challenge.delete()
+
+        PSChallengeFactory(device=ps_device, token=token, confirm=False)
+        cache.clear()
+
+        # existing unconfirmed challenges are updated
+        response, queries = verify(0, ps_device.value)
+
+        self.assertEqual(queries, 3)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["verifications-left"], 1)
+
+        challenge = type(ps_device).challenge.objects.get(token=token)
+        self.assertTrue(challenge.confirm)
+
+    def test_concurrent_verification(self):
+        """
+        Test that losing the race to insert a challenge fails verification.
+        """
+        token = get_token_object(self.auth)
+        device = PSDeviceFactory(user=self.user)
+
+        get_user_challenge = MultiFactorVerifierViewSet.get_user_challenge
+
+        def concurrent(view, request, dev):
+            challenge = get_user_challenge(view, request, dev)
+            PSChallengeFactory(device=device, token=token, confirm=True)
+
+            return challenge
+
+        request = APIRequestFactory().post("/", {"value": device.value})
+        force_authenticate(request, self.user, token)
+
+        with patch.object(MultiFactorVerifierViewSet, "get_user_challenge",
+                          concurrent):
+            response = multi_factor_viewset(request, index=0)
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(type(device).challenge.objects.count(), 1)
+
     def test_successful_dispatch(self):
         """
         The dispatching of the challenge.
@@ -4,10 +4,17 @@ __all__ = (
 
     "token_auth_header",
     "basic_auth_header",
+
+    "count_queries",
+    "verify_device",
 )
 
 import base64
 
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from rest_multi_factor.viewsets import MultiFactorVerifierViewSet
+
 
 def get_token_object(auth):
     """
@@ -69,3 +76,45 @@ def basic_auth_header(username, password):
     credentials = base64.b64encode(credentials).decode("iso-8859-1")
 
     return "basic {credentials}".format(credentials=credentials)
+
+
+def count_queries(captured):
+    """
+    Count the captured queries, except for the savepoint statements
+    of transactions.
+
+    :param captured: The queries captured by a CaptureQueriesContext
+    :type captured: list of dict
+
+    :return: The number of queries
+    :rtype: int
+    """
+    return sum(1 for query in captured if "SAVEPOINT" not in query["sql"])
+
+
+def verify_device(device, value, user, auth):
+    """
+    Verify a device through the verifier viewset.
+
+    :param device: The device to verify
+    :type device: rest_multi_factor.models.Device
+
+    :param value: The value to verify the device with
+    :type value: str
+
+    :param user: The user that makes the request
+    :type user: django.contrib.auth.models.AbstractBaseUser
+
+    :param auth: The token that makes the request
+    :type auth: rest_framework.authtoken.models.Token
+
+    :return: The response of the viewset
+    :rtype: rest_framework.response.Response
+    """
+    view = MultiFactorVerifierViewSet.as_view({"post": "verify"})
+    index = MultiFactorVerifierViewSet().get_devices().index(type(device))
+
+    request = APIRequestFactory().post("/", {"value": value})
+    force_authenticate(request, user, auth)
+
+    return view(request, index=index)